@@ -1,11 +1,12 @@
 import os
 import re
-import requests
 import logging
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-import spotipy
-from spotipy import SpotifyOAuth
+import html_cache
+import metrics
+from spotify_batch import PLAYLIST_ITEMS_PER_CALL, chunked
+from spotify_client import lazy_spotify
+from title_chooser import choose_songs
 
 # Load environment variables
 load_dotenv()
@@ -22,33 +23,49 @@ logger = logging.getLogger(__name__)
 
 # Spotify setup
 scope = "playlist-modify-public"
-spotify = spotipy.Spotify(auth_manager=SpotifyOAuth(
-    client_id=SPOTIFY_CLIENT_ID,
-    client_secret=SPOTIFY_CLIENT_SECRET,
-    redirect_uri=SPOTIFY_REDIRECT_URI,
-    scope=scope,
-    username=SPOTIFY_USERNAME,
-    open_browser=False
-))
+def _auth_manager():
+    from spotipy import SpotifyOAuth
+
+    return SpotifyOAuth(
+        client_id=SPOTIFY_CLIENT_ID,
+        client_secret=SPOTIFY_CLIENT_SECRET,
+        redirect_uri=SPOTIFY_REDIRECT_URI,
+        scope=scope,
+        username=SPOTIFY_USERNAME,
+        open_browser=False
+    )
+
+# Built on first use so importing this module needs no credentials
+spotify = lazy_spotify(_auth_manager)
 
 # Fetch HTML with rendering enabled
-def fetch_html(url):
+def fetch_html(url, refresh=False):
+    import requests
+
+    cache = html_cache.default_cache()
+    html = None if refresh else cache.get(url, render=True)
+    if html is not None:
+        metrics.record("brightdata", "request", "cache_hit")
+        logger.info(f"♻️ Using cached HTML for {url}")
+        return html
+
     logger.info(f"🌐 Fetching rendered HTML via Bright Data for {url}")
-    response = requests.post(
-        "https://api.brightdata.com/request",
-        headers={"Authorization": f"Bearer {BRIGHTDATA_API_KEY}"},
-        json={
-            "zone": BRIGHTDATA_ZONE,
-            "url": url,
-            "format": "raw",
-            "render": True  # ✅ important fix
-        }
-    )
+    with metrics.timed("brightdata", "request") as call:
+        response = requests.post(
+            "https://api.brightdata.com/request",
+            headers={"Authorization": f"Bearer {BRIGHTDATA_API_KEY}"},
+            json={
+                "zone": BRIGHTDATA_ZONE,
+                "url": url,
+                "format": "raw",
+                "render": True  # ✅ important fix
+            }
+        )
+        call.status = response.status_code
     if response.status_code == 200:
         html = response.text
-        with open("brightdata_tracklist.html", "w", encoding="utf-8") as f:
-            f.write(html)
-        print("✅ HTML saved to brightdata_tracklist.html")
+        path = cache.set(url, html, render=True)
+        print(f"✅ HTML cached at {path}")
         return html
     else:
         logger.error(f"❌ Bright Data fetch failed: {response.status_code}\n{response.text[:300]}")
@@ -56,20 +73,28 @@ def fetch_html(url):
 
 # Extract tracks in the format "1. Artist – Title"
 def extract_tracks(html):
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     text = soup.get_text()
     matches = re.findall(r'\d+\.\s+(.*?)\s+–\s+(.*)', text)
     tracks = [f"{artist.strip()} - {title.strip()}" for artist, title in matches]
     return list(set(tracks))  # Deduplicate
 
-# Search for tracks on Spotify
-def find_spotify_uris(track_names):
-    uris = []
+# Search for tracks on Spotify and pick the best candidate for each
+def find_spotify_uris(track_names, candidates_per_track=5):
+    queries = []
+    candidate_lists = []
     for track in track_names:
-        result = spotify.search(track, type="track", limit=1)
-        items = result["tracks"]["items"]
-        if items:
-            uris.append(items[0]["uri"])
+        artist, _, title = track.partition(" - ")
+        queries.append((title or artist, artist if title else None))
+        result = spotify.search(track, type="track", limit=candidates_per_track)
+        candidate_lists.append(result["tracks"]["items"])
+
+    uris = []
+    for track, chosen in zip(track_names, choose_songs(queries, candidate_lists)):
+        if chosen:
+            uris.append(chosen["uri"])
             print(f"✅ Found: {track}")
         else:
             print(f"❌ Not found: {track}")
@@ -78,12 +103,13 @@ def find_spotify_uris(track_names):
 # Create a playlist and add tracks
 def create_playlist(playlist_name, uris):
     playlist = spotify.user_playlist_create(SPOTIFY_USERNAME, playlist_name, public=True)
-    spotify.playlist_add_items(playlist["id"], uris)
+    for batch in chunked(uris, PLAYLIST_ITEMS_PER_CALL):
+        spotify.playlist_add_items(playlist["id"], batch)
     print(f"🎧 Playlist created: {playlist['external_urls']['spotify']}")
 
 # Orchestrator
-def main(url, playlist_name="Escuchar"):
-    html = fetch_html(url)
+def main(url, playlist_name="Escuchar", refresh=False):
+    html = fetch_html(url, refresh)
     if not html:
         return
 
@@ -98,13 +124,15 @@ def main(url, playlist_name="Escuchar"):
         create_playlist(playlist_name, uris)
     else:
         print("❌ No tracks found on Spotify.")
+    logger.info(f"🗄️ Spotify cache: {spotify.cache.summary()}")
+    logger.info(f"🗄️ HTML cache: {html_cache.default_cache().summary()}")
 
 # CLI
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) < 2:
-        print("Usage: python3 brightdata_to_spotify.py <1001tracklists_url>")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print("Usage: python3 brightdata_to_spotify.py <1001tracklists_url> [--refresh]")
         sys.exit(1)
 
-    url = sys.argv[1]
-    main(url)
+    main(args[0], refresh="--refresh" in sys.argv[1:])
@@ -0,0 +1,210 @@
+"""
+Persistent artist-name -> Spotify artist ID index.
+
+`get_artist_id` in main.py and festival_playlist.py checks here before
+searching. Names are keyed by `normalize_name` (Unicode NFKC, casefolded,
+performance tags like "(Live)" or "(DJ Set)" dropped), so the spellings a
+lineup uses from year to year share one entry. Each entry keeps the chosen
+ID and the candidate list it was picked from.
+
+Names that returned no candidates are stored too, with a shorter expiry
+(ARTIST_INDEX_NEGATIVE_TTL), so "Pop-Kultur Lokal" is not searched again on
+every run but does get retried eventually. Manual pins live in a small JSON
+file (ARTIST_PINS_PATH) and always win; they are never expired or evicted.
+
+Usage:
+    python artist_index.py                          # index size and pins
+    python artist_index.py --show "Die Nerven"
+    python artist_index.py --pin "Anika" 4hqAbgnd1a5yWxGDq4I1Ly
+    python artist_index.py --unpin "Anika"
+    python artist_index.py --forget "Anika"         # re-search on next run
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+import metrics
+from disk_cache import DiskCache
+
+DEFAULT_INDEX_PATH = ".artist_index.sqlite"
+DEFAULT_PINS_PATH = "artist_pins.json"
+DEFAULT_MAX_ENTRIES = 100000
+
+DAY = 24 * 60 * 60
+# Chosen IDs only change when a more popular namesake appears; misses are
+# more often a new artist who hasn't released yet
+DEFAULT_POSITIVE_TTL = 180 * DAY
+DEFAULT_NEGATIVE_TTL = 14 * DAY
+
+# Lineup annotations, not part of the artist name: "(Live)", "[DJ Set]", "- live set", "(cancelled)"
+PERFORMANCE_TAG_RE = re.compile(
+    r"\s*[(\[][^()\[\]]*\b(?:live|dj|dj[ -]?set|live[ -]?set|cancell?ed|abgesagt)\b[^()\[\]]*[)\]]"
+    r"|\s+[-–]\s+(?:live|dj)(?:[ -]?set)?\s*$"
+    r"|\s+(?:live|dj)[ -]?set\s*$",
+    re.IGNORECASE,
+)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_name(name: str) -> str:
+    """Index key for an artist name: NFKC, casefolded, performance tags removed."""
+    text = unicodedata.normalize("NFKC", name or "")
+    text = PERFORMANCE_TAG_RE.sub("", text)
+    return " ".join(text.casefold().split())
+
+
+def _candidate_summary(candidates: List[Dict]) -> List[Dict]:
+    return [
+        {"id": c["id"], "name": c.get("name"), "popularity": c.get("popularity", 0)}
+        for c in candidates
+        if c and c.get("id")
+    ]
+
+
+class ArtistIndex:
+    """Name -> artist ID lookups backed by a DiskCache, with negative entries and pins."""
+
+    def __init__(self, cache: DiskCache, pins_path: str = DEFAULT_PINS_PATH,
+                 positive_ttl: Optional[float] = DEFAULT_POSITIVE_TTL,
+                 negative_ttl: Optional[float] = DEFAULT_NEGATIVE_TTL):
+        self.cache = cache
+        self.pins_path = pins_path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._pins = None
+        self._stats = {"hits": 0, "negative_hits": 0, "pinned_hits": 0, "misses": 0}
+
+    def lookup(self, artist_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Indexed entry for the name, or None if it has to be searched.
+
+        A found entry has `artist_id` set; a cached miss has `artist_id` None.
+        """
+        key = normalize_name(artist_name)
+        pin = self.pins().get(key)
+        if pin:
+            self._count("pinned_hits")
+            return {"artist_id": pin["artist_id"], "name": pin.get("name"), "candidates": [], "pinned": True}
+
+        entry = self.cache.get("artist:" + key)
+        if entry is None:
+            self._count("misses")
+            return None
+        self._count("hits" if entry["artist_id"] else "negative_hits")
+        metrics.record("spotify", "artist_index", "cache_hit")
+        return entry
+
+    def remember(self, artist_name: str, artist_id: Optional[str], candidates: List[Dict], chosen_name: Optional[str] = None):
+        """Store a search outcome; `artist_id=None` records a miss with the negative TTL."""
+        entry = {
+            "artist_id": artist_id,
+            "name": chosen_name,
+            "query": artist_name,
+            "candidates": _candidate_summary(candidates),
+            "indexed_at": time.time(),
+        }
+        ttl = self.positive_ttl if artist_id else self.negative_ttl
+        self.cache.set("artist:" + normalize_name(artist_name), entry, ttl=ttl)
+
+    def forget(self, artist_name: str):
+        self.cache.delete("artist:" + normalize_name(artist_name))
+
+    def pins(self) -> Dict[str, Dict]:
+        with self._lock:
+            if self._pins is None:
+                try:
+                    with open(self.pins_path, encoding="utf-8") as f:
+                        self._pins = json.load(f)
+                except FileNotFoundError:
+                    self._pins = {}
+            return self._pins
+
+    def pin(self, artist_name: str, artist_id: str):
+        """Always resolve this name to `artist_id`, whatever search says."""
+        pins = dict(self.pins())
+        pins[normalize_name(artist_name)] = {"name": artist_name, "artist_id": artist_id}
+        self._save_pins(pins)
+
+    def unpin(self, artist_name: str) -> bool:
+        pins = dict(self.pins())
+        if pins.pop(normalize_name(artist_name), None) is None:
+            return False
+        self._save_pins(pins)
+        return True
+
+    def _save_pins(self, pins: Dict[str, Dict]):
+        tmp_path = self.pins_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pins, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.pins_path)
+        with self._lock:
+            self._pins = pins
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def summary(self) -> str:
+        with self._lock:
+            stats = dict(self._stats)
+        resolved = stats["hits"] + stats["negative_hits"] + stats["pinned_hits"]
+        return (
+            f"{resolved} resolved without search ({stats['pinned_hits']} pinned, "
+            f"{stats['negative_hits']} known misses), {stats['misses']} searched"
+        )
+
+
+def default_index() -> ArtistIndex:
+    """Process-wide index (ARTIST_INDEX_PATH, ARTIST_PINS_PATH, ARTIST_INDEX_NEGATIVE_TTL)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ArtistIndex(
+                DiskCache(
+                    os.getenv("ARTIST_INDEX_PATH", DEFAULT_INDEX_PATH),
+                    max_entries=int(os.getenv("ARTIST_INDEX_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                ),
+                pins_path=os.getenv("ARTIST_PINS_PATH", DEFAULT_PINS_PATH),
+                positive_ttl=float(os.getenv("ARTIST_INDEX_TTL", DEFAULT_POSITIVE_TTL)),
+                negative_ttl=float(os.getenv("ARTIST_INDEX_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL)),
+            )
+        return _index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and pin artist name resolutions")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--show", metavar="NAME", help="Print the indexed entry for NAME")
+    group.add_argument("--pin", nargs=2, metavar=("NAME", "ARTIST_ID"), help="Always resolve NAME to ARTIST_ID")
+    group.add_argument("--unpin", metavar="NAME")
+    group.add_argument("--forget", metavar="NAME", help="Drop the indexed entry so NAME is searched again")
+    args = parser.parse_args()
+
+    index = default_index()
+    if args.show:
+        entry = index.lookup(args.show)
+        print(f"🔑 {normalize_name(args.show)!r}")
+        print(json.dumps(entry, ensure_ascii=False, indent=1) if entry else "   not indexed")
+    elif args.pin:
+        index.pin(*args.pin)
+        print(f"📌 Pinned {args.pin[0]!r} -> {args.pin[1]}")
+    elif args.unpin:
+        print(f"📌 Unpinned {args.unpin!r}" if index.unpin(args.unpin) else f"   {args.unpin!r} was not pinned")
+    elif args.forget:
+        index.forget(args.forget)
+        print(f"🧹 Forgot {args.forget!r}")
+    else:
+        entries = index.cache.values()
+        misses = sum(1 for entry in entries if not entry["artist_id"])
+        print(f"🎤 {len(entries)} indexed names ({misses} known misses), "
+              f"{len(index.pins())} pins in {index.pins_path}")
@@ -0,0 +1,73 @@
+"""
+Regression check and throughput benchmark for track_extractor backends.
+
+Parses every page in the corpus with each installed backend, verifies the
+extracted tracks match the reference bs4 backend exactly, and reports pages
+per second for each.
+
+Usage:
+    python benchmarks/bench_extractor_backends.py                  # sets/*.html
+    python benchmarks/bench_extractor_backends.py --input saved_pages --repeat 3
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from track_extractor import BACKENDS, extract_tracks_from_html  # noqa: E402
+
+BACKEND_MODULES = {"bs4": "bs4", "lxml": "lxml", "selectolax": "selectolax"}
+
+
+def load_corpus(input_dir):
+    pages = []
+    for file in sorted(os.listdir(input_dir)):
+        if file.endswith(".html"):
+            with open(os.path.join(input_dir, file), "r", encoding="utf-8") as f:
+                pages.append((file, f.read()))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default="sets", help="Folder of saved tracklist pages (default: sets/)")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per backend")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input):
+        print(f"❌ Corpus folder '{args.input}' not found")
+        sys.exit(1)
+    pages = load_corpus(args.input)
+    if not pages:
+        print(f"❌ No .html files in '{args.input}'")
+        sys.exit(1)
+
+    backends = [b for b in BACKENDS if importlib.util.find_spec(BACKEND_MODULES[b])]
+    print(f"📄 {len(pages)} pages, {sum(len(html) for _, html in pages) / 1e6:.1f} MB; backends: {', '.join(backends)}\n")
+
+    reference = {file: extract_tracks_from_html(html, file, "bs4") for file, html in pages}
+    mismatched_backends = 0
+
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results = {file: extract_tracks_from_html(html, file, backend) for file, html in pages}
+        elapsed = time.perf_counter() - start
+
+        mismatches = [file for file in reference if results[file] != reference[file]]
+        rate = len(pages) * args.repeat / elapsed
+        status = "✅ identical" if not mismatches else f"❌ {len(mismatches)} page(s) differ"
+        print(f"   {backend:<11} {rate:8.1f} pages/s   {status}")
+        for file in mismatches[:5]:
+            print(f"      - {file}: {len(results[file])} tracks vs {len(reference[file])} (bs4)")
+        mismatched_backends += bool(mismatches)
+
+    sys.exit(1 if mismatched_backends else 0)
+
+
+if __name__ == "__main__":
+    main()
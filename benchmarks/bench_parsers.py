@@ -0,0 +1,123 @@
+"""
+Time and peak memory of the tracklist parsers per layout and page size.
+
+Covers track_extractor.extract_tracks_from_html on every layout it handles,
+clean_redundant_artist_from_title on its output, and 1003scraper's
+extract_tracks on numbered pages. Pages come from synthetic_pages, sized in
+tracks per page; saved pages can be added with --input and are sized in KB.
+
+Usage:
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --sizes 10,1000 --repeat 5 --backend lxml
+    python benchmarks/bench_parsers.py --input sets --json parsers.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_pages import synthetic_page  # noqa: E402
+from track_extractor import (  # noqa: E402
+    BACKENDS,
+    DEFAULT_BACKEND,
+    clean_redundant_artist_from_title,
+    extract_tracks_from_html,
+)
+
+EXTRACTOR_LAYOUTS = ("trackValue", "trackFormat__text", "schema.org", "text")
+DEFAULT_SIZES = "10,100,1000,10000"
+
+
+def load_1003scraper():
+    """Import 1003scraper by path (its name isn't a valid identifier); None if its deps are missing."""
+    spec = importlib.util.spec_from_file_location("scraper_1003", os.path.join(ROOT, "1003scraper.py"))
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        print(f"⚠️ Skipping 1003scraper.extract_tracks: {e}")
+        return None
+    return module
+
+
+def measure(func, repeat):
+    """Best wall time over `repeat` runs, then peak traced memory of one more run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def report(results, target, layout, size, found, seconds, peak):
+    results.append({
+        "target": target,
+        "layout": layout,
+        "size": size,
+        "found": found,
+        "ms": round(seconds * 1000, 3),
+        "peak_mb": round(peak / 1e6, 3),
+    })
+    print(f"   {target:<26} {layout:<20} {size:>7} {found:>6} {seconds * 1000:>10.2f} {peak / 1e6:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Tracks per synthetic page (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the best is reported")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=BACKENDS, help="track_extractor backend")
+    parser.add_argument("--input", help="Also benchmark saved .html pages from this folder")
+    parser.add_argument("--json", help="Write results to this file for comparing runs")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    scraper = load_1003scraper()
+    results = []
+
+    print(f"   {'target':<26} {'layout':<20} {'size':>7} {'found':>6} {'best ms':>10} {'peak MB':>9}")
+    for layout in EXTRACTOR_LAYOUTS:
+        for size in sizes:
+            html = synthetic_page(layout, size)
+            tracks, seconds, peak = measure(lambda: extract_tracks_from_html(html, "synthetic.html", args.backend), args.repeat)
+            report(results, "extract_tracks_from_html", layout, size, len(tracks), seconds, peak)
+
+            cleaned, seconds, peak = measure(lambda: clean_redundant_artist_from_title(tracks), args.repeat)
+            report(results, "clean_redundant_artist", layout, size, len(cleaned), seconds, peak)
+
+    if scraper is not None:
+        for size in sizes:
+            html = synthetic_page("numbered", size)
+            tracks, seconds, peak = measure(lambda: scraper.extract_tracks(html), args.repeat)
+            report(results, "1003scraper.extract", "numbered", size, len(tracks), seconds, peak)
+
+    if args.input:
+        for file in sorted(os.listdir(args.input)):
+            if not file.endswith(".html"):
+                continue
+            with open(os.path.join(args.input, file), "r", encoding="utf-8") as f:
+                html = f.read()
+            tracks, seconds, peak = measure(lambda: extract_tracks_from_html(html, file, args.backend), args.repeat)
+            report(results, "extract_tracks_from_html", file[:20], f"{len(html) // 1024}KB", len(tracks), seconds, peak)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"backend": args.backend, "results": results}, f, indent=1)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Cold-start cost of importing each module and of short CLI invocations.
+
+Every case runs in a fresh interpreter with Spotify/OpenAI credentials
+stripped from the environment, so a module that builds a client at import
+time shows up as a failure rather than a slow number. Reports the best wall
+time over --repeat runs and, with --top, the slowest imports from
+`python -X importtime`.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --top 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    "track_extractor",
+    "track_sinks",
+    "title_rules",
+    "title_chooser",
+    "main",
+    "festival_playlist",
+    "fetch_html",
+    "html_cache",
+    "llm_cache",
+    "artist_index",
+)
+COMMANDS = (
+    ("track_extractor.py --help", ["track_extractor.py", "--help"]),
+    ("track_sinks.py --help", ["track_sinks.py", "--help"]),
+    ("fetch_html.py --help", ["fetch_html.py", "--help"]),
+)
+CREDENTIAL_PREFIXES = ("SPOTIPY_", "SPOTIFY_", "OPENAI_", "BRIGHT")
+
+
+def clean_env():
+    env = {k: v for k, v in os.environ.items() if not k.startswith(CREDENTIAL_PREFIXES)}
+    env["METRICS_SUMMARY"] = "0"
+    return env
+
+
+def run(argv, env):
+    start = time.perf_counter()
+    result = subprocess.run(argv, cwd=ROOT, env=env, capture_output=True, text=True)
+    return time.perf_counter() - start, result
+
+
+def slowest_imports(module, env, top):
+    """(cumulative µs, module) for the slowest imports under `import module`."""
+    _, result = run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env)
+    imports = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"; children print before parents
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if name.strip() == "site":
+            # Everything so far was interpreter startup, not the module
+            imports = []
+        elif name.strip() != module:
+            imports.append((int(cumulative_us), name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best is reported")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports per module")
+    args = parser.parse_args()
+
+    env = clean_env()
+    baseline = min(run([sys.executable, "-c", "pass"], env)[0] for _ in range(args.repeat))
+    print(f"🐍 Bare interpreter: {baseline * 1000:.0f} ms (subtracted below)\n")
+
+    cases = [(f"import {module}", [sys.executable, "-c", f"import {module}"]) for module in MODULES]
+    cases += [(label, [sys.executable] + argv) for label, argv in COMMANDS]
+
+    failures = 0
+    for label, argv in cases:
+        best = float("inf")
+        result = None
+        for _ in range(args.repeat):
+            seconds, result = run(argv, env)
+            best = min(best, seconds)
+        if result.returncode != 0:
+            failures += 1
+            error = (result.stderr.strip().splitlines() or ["?"])[-1]
+            print(f"   {label:<32} ❌ {error[:80]}")
+            continue
+        print(f"   {label:<32} {(best - baseline) * 1000:>7.0f} ms")
+        if args.top and label.startswith("import "):
+            for cumulative_us, name in slowest_imports(label.split()[1], env, args.top):
+                print(f"      {cumulative_us / 1000:>7.1f} ms  {name}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark the rule-based title cleaner against our tracklist corpus.
+
+Reports how many titles the local rules clean confidently (and so never
+reach the LLM), the per-title cost, and a sample of the ones they escalate.
+
+Usage:
+    python benchmarks/bench_title_rules.py                 # parse sets/*.html
+    python benchmarks/bench_title_rules.py --csv tracks_output.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from title_rules import CONFIDENCE_THRESHOLD, rule_clean_track_name  # noqa: E402
+
+
+def load_titles_from_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [f"{row['artist']} - {row['title']}" for row in csv.DictReader(f)]
+
+
+def load_titles_from_sets(input_dir):
+    from track_extractor import extract_tracks_from_html
+
+    titles = []
+    for file in sorted(os.listdir(input_dir)):
+        if file.endswith(".html"):
+            with open(os.path.join(input_dir, file), "r", encoding="utf-8") as f:
+                tracks = extract_tracks_from_html(f.read(), file)
+            titles.extend(f"{artist} - {title}" for title, artist, _ in tracks)
+    return titles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default="sets", help="Folder of saved tracklist pages (default: sets/)")
+    parser.add_argument("--csv", help="Read titles from a track_extractor CSV instead of parsing HTML")
+    parser.add_argument("--samples", type=int, default=15, help="Escalated titles to print")
+    args = parser.parse_args()
+
+    if args.csv:
+        titles = load_titles_from_csv(args.csv)
+    elif os.path.isdir(args.input):
+        titles = load_titles_from_sets(args.input)
+    else:
+        print(f"❌ No corpus found: '{args.input}' is not a folder and no --csv given")
+        sys.exit(1)
+
+    if not titles:
+        print("❌ Corpus contains no titles")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = [rule_clean_track_name(title) for title in titles]
+    elapsed = time.perf_counter() - start
+
+    fast = sum(1 for _, confidence in results if confidence >= CONFIDENCE_THRESHOLD)
+    buckets = Counter(min(int(confidence * 10), 9) / 10 for _, confidence in results)
+
+    print(f"🎚️  Titles:           {len(titles)}")
+    print(f"⚡ Rules only:        {fast} ({fast / len(titles):.1%}) never reach the network")
+    print(f"🤖 Escalated to LLM:  {len(titles) - fast} ({(len(titles) - fast) / len(titles):.1%})")
+    print(f"⏱️  Cost:              {elapsed / len(titles) * 1e6:.1f} µs/title ({elapsed * 1000:.1f} ms total)")
+    print("\nConfidence distribution:")
+    for bucket in sorted(buckets):
+        print(f"   {bucket:.1f}-{bucket + 0.1:.1f}: {buckets[bucket]}")
+
+    escalated = [(title, cleaned, confidence) for title, (cleaned, confidence) in zip(titles, results)
+                 if confidence < CONFIDENCE_THRESHOLD]
+    if escalated:
+        print(f"\nSample escalated titles (threshold {CONFIDENCE_THRESHOLD}):")
+        for title, cleaned, confidence in escalated[:args.samples]:
+            print(f"   {confidence:.2f}  {title!r} -> {cleaned!r}")
+
+
+if __name__ == "__main__":
+    main()
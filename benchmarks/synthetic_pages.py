@@ -0,0 +1,82 @@
+"""
+Synthetic tracklist pages for the parser benchmarks.
+
+Each layout mirrors one the extractors look for, wrapped in the kind of page
+chrome (scripts, styles, navigation, comments) the real sites carry:
+
+    trackValue         1001Tracklists <span class="trackValue"> rows
+    trackFormat__text  older 1001Tracklists <div class="trackFormat__text"> rows
+    schema.org         Beatport-style MusicRecording microdata
+    text               bare "Artist - Title" lines (track_extractor's crude fallback)
+    numbered           "1. Artist – Title" lines (1003scraper.extract_tracks)
+
+Output is deterministic for a given (layout, n_tracks, seed).
+"""
+
+import random
+from typing import List, Tuple
+
+LAYOUTS = ("trackValue", "trackFormat__text", "schema.org", "text", "numbered")
+
+_WORDS = (
+    "midnight", "echo", "solar", "drift", "velvet", "pulse", "neon", "horizon", "acid",
+    "dust", "shadow", "river", "signal", "glass", "ember", "cosmic", "tide", "static",
+)
+_VERSIONS = ("", " (Extended Mix)", " (Original Mix)", " (Radio Edit)", " (Dub)", " (VIP)")
+_LABELS = ("", " [AFTERLIFE]", " [DRUMCODE]", " [KOMPAKT]", " [NEO RECORDS / ROBBINS]")
+
+_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Synthetic Set - {n} tracks</title>
+<style>.tlpItem {{ margin: 0 }} .trackValue:hover {{ color: red }}</style>
+<script>window.__config = {{"tracks": {n}, "title": "Artist - Not A Track"}};</script>
+</head><body>
+<nav><a href="/">Home</a> | <a href="/login">Login</a></nav>
+<!-- generated page - do not edit -->
+"""
+_FOOT = """<footer><p>&copy; Synthetic Tracklists</p></footer>
+<script>console.log("Some - Thing");</script>
+</body></html>
+"""
+
+
+def synthetic_tracks(n_tracks: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """(artist, title) pairs with remix/label noise like real tracklists."""
+    rng = random.Random(seed)
+    tracks = []
+    for _ in range(n_tracks):
+        artist = " ".join(rng.choice(_WORDS).title() for _ in range(rng.randint(1, 2)))
+        if rng.random() < 0.2:
+            artist += " & " + rng.choice(_WORDS).title()
+        title = " ".join(rng.choice(_WORDS).title() for _ in range(rng.randint(1, 3)))
+        tracks.append((artist, title + rng.choice(_VERSIONS) + rng.choice(_LABELS)))
+    return tracks
+
+
+def synthetic_page(layout: str, n_tracks: int, seed: int = 0) -> str:
+    """Return a full HTML page with n_tracks tracks in the given layout."""
+    tracks = synthetic_tracks(n_tracks, seed)
+    if layout == "trackValue":
+        rows = [
+            f'<div class="tlpItem" id="tlp_{i}"><span class="trackValue notranslate">'
+            f'{artist} - {title}</span><span class="trackTime">{i:02d}:00</span></div>'
+            for i, (artist, title) in enumerate(tracks)
+        ]
+    elif layout == "trackFormat__text":
+        rows = [
+            f'<div class="trackFormat"><div class="trackFormat__text">{artist} - {title}</div></div>'
+            for artist, title in tracks
+        ]
+    elif layout == "schema.org":
+        rows = [
+            '<div itemscope itemtype="http://schema.org/MusicRecording">'
+            f'<meta itemprop="name" content="{title}"><meta itemprop="byArtist" content="{artist}">'
+            f'<span>{artist}</span></div>'
+            for artist, title in tracks
+        ]
+    elif layout == "text":
+        rows = [f"<p>{artist} - {title}</p>" for artist, title in tracks]
+    elif layout == "numbered":
+        rows = ["<pre>" + "\n".join(f"{i}. {artist} – {title}" for i, (artist, title) in enumerate(tracks, 1)) + "</pre>"]
+    else:
+        raise ValueError(f"Unknown layout {layout!r}; expected one of {LAYOUTS}")
+    return _HEAD.format(n=n_tracks) + "\n".join(rows) + "\n" + _FOOT
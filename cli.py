@@ -0,0 +1,339 @@
+"""
+Unified command line for the playlist tools, with an optional warm daemon.
+
+    python cli.py artists "Daft Punk, The Weeknd" --playlist "My Mix"
+    python cli.py festival lineup.txt --playlist "Pop-Kultur 2025"
+    python cli.py tracklist https://www.1001tracklists.com/tracklist/...
+
+Each job runs in this process by default. Start `python cli.py serve` once
+and later jobs are sent to it over a local Unix socket instead: the daemon
+has already read .env, holds refreshed OAuth tokens, keep-alive connections
+and the in-memory tiers of every cache, so back-to-back jobs skip all of
+that. Job output (prints and log records) is streamed back to the
+submitting terminal. Jobs run one at a time; `status` and `stop` answer
+immediately.
+"""
+
+import importlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+import click
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"music-daemon-{os.getuid()}.sock")
+
+
+def _run_artists(params):
+    importlib.import_module("main").main(params["artists"], params["playlist"], resume=params.get("resume", False))
+
+
+def _run_festival(params):
+    importlib.import_module("festival_playlist").main(
+        params["lineup"], params["playlist"], engine=params["engine"], resume=params.get("resume", False)
+    )
+
+
+def _run_tracklist(params):
+    # Module name starts with a digit, so it can only be imported by string
+    importlib.import_module("1003scraper").main(params["url"], params["playlist"], refresh=params["refresh"])
+
+
+JOBS = {
+    "artists": _run_artists,
+    "festival": _run_festival,
+    "tracklist": _run_tracklist,
+}
+
+
+class _LineWriter:
+    """Forwards one job's output to its client as JSON lines; safe to call from the job's threads."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+        self._lock = threading.Lock()
+
+    def send(self, kind, text):
+        if not text:
+            return
+        with self._lock:
+            try:
+                self._wfile.write((json.dumps({"type": kind, "text": text}) + "\n").encode("utf-8"))
+                self._wfile.flush()
+            except (BrokenPipeError, ConnectionResetError, ValueError):
+                pass  # client went away; the job keeps running
+
+
+class _JobStdout:
+    """
+    Installed once as the daemon's sys.stdout. Writes go to the running job's
+    client (from any thread the job started) or, between jobs, to the
+    daemon's own stdout.
+    """
+
+    def __init__(self, server, stream):
+        self._server = server
+        self._stream = stream
+
+    def write(self, text):
+        writer = self._server.job_writer
+        if writer is None:
+            return self._stream.write(text)
+        writer.send("output", text)
+        return len(text)
+
+    def flush(self):
+        if self._server.job_writer is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _JobLogHandler(logging.Handler):
+    """Streams log records emitted during a job to its client's stderr."""
+
+    def __init__(self, server):
+        super().__init__(level=logging.INFO)
+        self._server = server
+        self.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    def emit(self, record):
+        writer = self._server.job_writer
+        if writer is not None:
+            writer.send("log", self.format(record) + "\n")
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8"))
+        except ValueError:
+            return self._send({"type": "done", "ok": False, "error": "bad request"})
+
+        server = self.server
+        job = request.get("job")
+        if job == "status":
+            return self._send({"type": "done", "ok": True, "status": server.status()})
+        if job == "stop":
+            self._send({"type": "done", "ok": True})
+            return threading.Thread(target=server.shutdown, daemon=True).start()
+        if job not in JOBS:
+            return self._send({"type": "done", "ok": False, "error": f"unknown job {job!r}"})
+
+        with server.job_lock:
+            server.current_job = job
+            server.job_writer = _LineWriter(self.wfile)
+            start = time.perf_counter()
+            ok, error = True, None
+            try:
+                JOBS[job](request.get("params", {}))
+            except SystemExit as e:
+                # The entry points sys.exit(1) after printing their error
+                if e.code not in (None, 0):
+                    ok, error = False, f"job exited with code {e.code}"
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            finally:
+                sys.stdout.flush()
+                server.job_writer = None
+                server.current_job = None
+                server.jobs_run += 1
+            self._send({"type": "done", "ok": ok, "error": error, "seconds": round(time.perf_counter() - start, 2)})
+
+    def _send(self, message):
+        try:
+            self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        # Owner-only socket: jobs act on the owner's Spotify account
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _DaemonHandler)
+        finally:
+            os.umask(old_umask)
+        self.job_lock = threading.Lock()
+        self.started = time.time()
+        self.jobs_run = 0
+        self.current_job = None
+        self.job_writer = None
+
+    def status(self):
+        status = {
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started),
+            "jobs_run": self.jobs_run,
+            "current_job": self.current_job,
+        }
+        # Only report caches a job has actually loaded
+        if "spotify_cache" in sys.modules:
+            status["spotify_cache"] = sys.modules["spotify_cache"].default_cache().summary()
+        if "llm_cache" in sys.modules:
+            status["llm_cache"] = sys.modules["llm_cache"].summary()
+        return status
+
+
+def _connect(socket_path):
+    """Connected socket to a live daemon, or None."""
+    if not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def submit(socket_path, job, params=None):
+    """
+    Send a job to the daemon and echo its output as it streams back.
+
+    Args:
+        socket_path (str): Daemon socket.
+        job (str): Job name ("artists", "festival", "tracklist", "status", "stop").
+        params (dict): Job parameters.
+
+    Returns:
+        dict: The daemon's final message, or None if no daemon is listening.
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as stream:
+        stream.write((json.dumps({"job": job, "params": params or {}}) + "\n").encode("utf-8"))
+        stream.flush()
+        for line in stream:
+            message = json.loads(line.decode("utf-8"))
+            if message["type"] == "output":
+                sys.stdout.write(message["text"])
+                sys.stdout.flush()
+            elif message["type"] == "log":
+                sys.stderr.write(message["text"])
+                sys.stderr.flush()
+            elif message["type"] == "done":
+                return message
+    return {"type": "done", "ok": False, "error": "daemon closed the connection"}
+
+
+def dispatch(ctx, job, params):
+    """Run a job on the daemon if one is up (and --local wasn't given), else in-process."""
+    if not ctx.obj["local"]:
+        result = submit(ctx.obj["socket"], job, params)
+        if result is not None:
+            if not result["ok"]:
+                raise click.ClickException(result.get("error") or "job failed")
+            click.echo(f"⚡ Ran on daemon in {result.get('seconds', 0)}s", err=True)
+            return
+    JOBS[job](params)
+
+
+@click.group()
+@click.option("--socket", "socket_path", envvar="MUSIC_DAEMON_SOCKET", default=DEFAULT_SOCKET, show_default=True,
+              help="Daemon socket path")
+@click.option("--local", is_flag=True, help="Run in this process even if a daemon is listening")
+@click.pass_context
+def cli(ctx, socket_path, local):
+    """Spotify playlist tools."""
+    ctx.obj = {"socket": socket_path, "local": local}
+
+
+@cli.command()
+@click.argument("artists")
+@click.option("--playlist", default="Escuchar", show_default=True)
+@click.option("--resume", is_flag=True, help="Continue the last interrupted run of these artists")
+@click.pass_context
+def artists(ctx, artists, playlist, resume):
+    """Add top, recent and album tracks for comma-separated ARTISTS."""
+    dispatch(ctx, "artists", {"artists": artists, "playlist": playlist, "resume": resume})
+
+
+@cli.command()
+@click.argument("lineup", type=click.File("r", encoding="utf-8"))
+@click.option("--playlist", default="Pop-Kultur Festival 2025", show_default=True)
+@click.option("--engine", type=click.Choice(["async", "threads"]), default="async", show_default=True)
+@click.option("--resume", is_flag=True, help="Continue the last interrupted run of this lineup")
+@click.pass_context
+def festival(ctx, lineup, playlist, engine, resume):
+    """Build a playlist from a festival LINEUP text file (- for stdin)."""
+    dispatch(ctx, "festival", {"lineup": lineup.read(), "playlist": playlist, "engine": engine, "resume": resume})
+
+
+@cli.command()
+@click.argument("url")
+@click.option("--playlist", default="Escuchar", show_default=True)
+@click.option("--refresh", is_flag=True, help="Ignore the cached page and fetch it again")
+@click.pass_context
+def tracklist(ctx, url, playlist, refresh):
+    """Build a playlist from a 1001tracklists URL."""
+    dispatch(ctx, "tracklist", {"url": url, "playlist": playlist, "refresh": refresh})
+
+
+@cli.command()
+@click.pass_context
+def serve(ctx):
+    """Run the daemon in the foreground until stopped."""
+    socket_path = ctx.obj["socket"]
+    if _connect(socket_path) is not None:
+        raise click.ClickException(f"A daemon is already listening on {socket_path}")
+    if os.path.exists(socket_path):
+        os.remove(socket_path)  # stale socket from a crashed daemon
+
+    server = _DaemonServer(socket_path)
+    # Installed once for the daemon's lifetime; they route by the running job, not by thread
+    real_stdout = sys.stdout
+    sys.stdout = _JobStdout(server, real_stdout)
+    log_handler = _JobLogHandler(server)
+    logging.getLogger().addHandler(log_handler)
+    click.echo(f"🛰️  Daemon listening on {socket_path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logging.getLogger().removeHandler(log_handler)
+        sys.stdout = real_stdout
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        click.echo("👋 Daemon stopped")
+
+
+@cli.command()
+@click.pass_context
+def status(ctx):
+    """Show whether a daemon is running and how warm it is."""
+    result = submit(ctx.obj["socket"], "status")
+    if result is None:
+        click.echo("💤 No daemon running")
+        return
+    for key, value in result["status"].items():
+        click.echo(f"   {key}: {value}")
+
+
+@cli.command()
+@click.pass_context
+def stop(ctx):
+    """Stop the running daemon."""
+    if submit(ctx.obj["socket"], "stop") is None:
+        click.echo("💤 No daemon running")
+    else:
+        click.echo("🛑 Daemon stopping")
+
+
+if __name__ == "__main__":
+    cli()
@@ -29,6 +29,8 @@ class Config:
     # External Services
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+    CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
+    CELERY_TASK_ALWAYS_EAGER: bool = os.getenv("CELERY_TASK_ALWAYS_EAGER", "False").lower() == "true"
 
     # Music-specific settings
     MUSIC_LIBRARY_PATH: str = os.getenv("MUSIC_LIBRARY_PATH", "./music_library")
@@ -56,6 +58,10 @@ class TestingConfig(Config):
     DEBUG = True
     ENVIRONMENT = "testing"
     DATABASE_URL = "sqlite:///:memory:"
+    # Tasks run in-process as they are queued; no broker or worker needed
+    CELERY_BROKER_URL = "memory://"
+    CELERY_RESULT_BACKEND = "cache+memory://"
+    CELERY_TASK_ALWAYS_EAGER = True
 
 
 # Configuration mapping
@@ -0,0 +1,165 @@
+"""
+Per-artist snapshot of everything the track selectors read.
+
+The top/recent/album selectors in main.py and festival_playlist.py used to
+each call `artist_albums` with their own overlapping filters and then load
+the same albums again. `ArtistDiscography.load` fetches the artist's top
+tracks and full release list (albums, singles, compilations, every page)
+once; selectors filter that list in memory and ask it for tracklists, which
+are loaded in 20-album batches and kept, so an album two selectors look at
+is only fetched once. A typical artist costs one `artist_albums` page, one
+`artist_top_tracks` and one or two `albums` calls.
+
+Release order is Spotify's: grouped album, single, compilation, each group
+newest first, which is what the old per-filter queries returned. Paging
+stops as soon as every selector's slice (RELEASE_NEEDS) is covered, and
+never goes past MAX_RELEASE_PAGES, so an artist with hundreds of singles
+and remix compilations still costs at most four `artist_albums` calls. The
+only selector that can miss anything to the cap is main.py's relaxed
+fallback, which reads compilations listed after the first 200 releases.
+
+asyncio and spotify_async are imported inside the async loaders, so the
+sync path (main.py) never pays for them at startup.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from spotify_batch import album_track_items, get_albums
+
+RELEASE_GROUPS = "album,single,compilation"
+GROUP_ORDER = ("album", "single", "compilation")
+RELEASES_PER_PAGE = 50
+MAX_RELEASE_PAGES = 4
+
+# The most any selector reads from each combination of groups (the first N, in order):
+# main's album ranking, the recent-releases pick, main's relaxed fallback
+RELEASE_NEEDS = (
+    (("album",), 50),
+    (("album", "single"), 20),
+    (("album", "compilation"), 20),
+)
+
+
+def _group(release: dict) -> str:
+    return release.get("album_group") or release.get("album_type")
+
+
+def releases_cover_needs(releases: List[dict]) -> bool:
+    """True once every RELEASE_NEEDS slice is fully known from `releases` (a prefix of the list)."""
+    if not releases:
+        return False
+    # Groups come in GROUP_ORDER, so every group before the last one seen is complete
+    last_group = _group(releases[-1])
+    last = GROUP_ORDER.index(last_group) if last_group in GROUP_ORDER else len(GROUP_ORDER)
+    for groups, needed in RELEASE_NEEDS:
+        have = sum(1 for release in releases if _group(release) in groups)
+        complete = all(GROUP_ORDER.index(group) < last for group in groups)
+        if have < needed and not complete:
+            return False
+    return True
+
+
+class ArtistDiscography:
+    """One artist's top tracks and releases, with album tracklists loaded on demand."""
+
+    def __init__(self, client, artist_id: str, releases: List[dict], top_tracks: List[dict]):
+        self.client = client
+        self.artist_id = artist_id
+        self.releases = releases
+        self.top_tracks = top_tracks
+        self._full_albums: Dict[str, dict] = {}
+        self._tracklists: Dict[str, List[dict]] = {}
+        self._loading = {}  # album_id -> task loading it, so concurrent selectors share the fetch
+
+    @classmethod
+    def load(cls, sp, artist_id: str, country: str = "US") -> "ArtistDiscography":
+        """Fetch the snapshot with the sync client."""
+        top_tracks = sp.artist_top_tracks(artist_id, country=country)["tracks"]
+        releases = []
+        for _ in range(MAX_RELEASE_PAGES):
+            # Explicit offsets rather than sp.next, so every page is a cacheable call
+            page = sp.artist_albums(artist_id, album_type=RELEASE_GROUPS, limit=RELEASES_PER_PAGE, offset=len(releases))
+            items = page.get("items") or []
+            releases.extend(items)
+            if not items or not page.get("next") or releases_cover_needs(releases):
+                break
+        return cls(sp, artist_id, releases, top_tracks)
+
+    @classmethod
+    async def load_async(cls, asp, artist_id: str, country: str = "US") -> "ArtistDiscography":
+        """Fetch the snapshot with an `AsyncSpotify`; pages after the first are fetched concurrently."""
+        import asyncio
+
+        top, first = await asyncio.gather(
+            asp.artist_top_tracks(artist_id, country=country),
+            asp.artist_albums(artist_id, album_type=RELEASE_GROUPS, limit=RELEASES_PER_PAGE, offset=0),
+        )
+        releases = list(first.get("items") or [])
+        total = first.get("total") or 0
+        if first.get("next") and total > len(releases) and not releases_cover_needs(releases):
+            last_offset = min(total, MAX_RELEASE_PAGES * RELEASES_PER_PAGE)
+            pages = await asyncio.gather(*(
+                asp.artist_albums(artist_id, album_type=RELEASE_GROUPS, limit=RELEASES_PER_PAGE, offset=offset)
+                for offset in range(RELEASES_PER_PAGE, last_offset, RELEASES_PER_PAGE)
+            ))
+            for page in pages:
+                releases.extend(page.get("items") or [])
+        return cls(asp, artist_id, releases, top["tracks"])
+
+    def of_type(self, *groups: str, limit: Optional[int] = None) -> List[dict]:
+        """Releases in the given groups ("album", "single", "compilation"), in Spotify's order."""
+        selected = [release for release in self.releases if _group(release) in groups]
+        return selected[:limit] if limit is not None else selected
+
+    def top_track_ids(self, limit: int) -> List[str]:
+        return [track["id"] for track in self.top_tracks[:limit] if track.get("id")]
+
+    def albums(self, album_ids: Iterable[str]) -> Dict[str, dict]:
+        """Full album objects for the IDs, fetching only those not loaded yet."""
+        album_ids = list(album_ids)
+        self._full_albums.update(get_albums(self.client, [a for a in album_ids if a not in self._full_albums]))
+        return {a: self._full_albums[a] for a in album_ids if a in self._full_albums}
+
+    def tracklists(self, album_ids: Iterable[str]) -> Dict[str, List[dict]]:
+        """{album_id: simplified track items}, loading missing albums in bulk."""
+        full_albums = self.albums(album_ids)
+        for album_id, album in full_albums.items():
+            if album_id not in self._tracklists:
+                self._tracklists[album_id] = album_track_items(self.client, album)
+        return {a: self._tracklists[a] for a in full_albums}
+
+    async def albums_async(self, album_ids: Iterable[str]) -> Dict[str, dict]:
+        from spotify_async import get_albums_async
+
+        album_ids = list(album_ids)
+        self._full_albums.update(
+            await get_albums_async(self.client, [a for a in album_ids if a not in self._full_albums])
+        )
+        return {a: self._full_albums[a] for a in album_ids if a in self._full_albums}
+
+    async def tracklists_async(self, album_ids: Iterable[str]) -> Dict[str, List[dict]]:
+        """Async `tracklists`; albums another caller is already loading are awaited, not fetched again."""
+        import asyncio
+
+        album_ids = list(dict.fromkeys(album_ids))
+        missing = [a for a in album_ids if a not in self._tracklists and a not in self._loading]
+        if missing:
+            task = asyncio.ensure_future(self._load_tracklists_async(missing))
+            self._loading.update((a, task) for a in missing)
+        pending = {self._loading[a] for a in album_ids if a in self._loading}
+        if pending:
+            await asyncio.gather(*pending)
+        return {a: self._tracklists[a] for a in album_ids if a in self._tracklists}
+
+    async def _load_tracklists_async(self, album_ids: List[str]):
+        import asyncio
+        from spotify_async import album_track_items_async
+
+        try:
+            full_albums = await self.albums_async(album_ids)
+            loaded = list(full_albums)
+            items = await asyncio.gather(*(album_track_items_async(self.client, full_albums[a]) for a in loaded))
+            self._tracklists.update(zip(loaded, items))
+        finally:
+            for album_id in album_ids:
+                self._loading.pop(album_id, None)
@@ -0,0 +1,187 @@
+"""
+Two-tier key/value cache: a bounded in-process LRU in front of SQLite.
+
+Values are stored as JSON with an optional per-entry expiry. The SQLite tier
+is capped at `max_entries`; when it grows past that, the least recently used
+rows are evicted. Safe to share between threads, and between processes via
+SQLite's own locking.
+
+Disk hits don't write: the new `accessed_at` is buffered and written in one
+batch with the next `set`, once `touch_batch` hits are pending, or on
+`flush`/`close`/interpreter exit. Losing a batch in a crash only makes
+eviction order slightly less exact.
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class DiskCache:
+    """LRU + SQLite cache with TTLs, a size cap and hit/miss/eviction stats."""
+
+    def __init__(self, path: str, max_entries: int = 50000, memory_entries: int = 1024, touch_batch: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.touch_batch = touch_batch
+        self._memory = OrderedDict()  # key -> (json text, expires_at)
+        self._touched = {}  # key -> accessed_at not yet written
+        self._closed = False
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "writes": 0,
+        }
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._db.commit()
+        atexit.register(self.flush)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                text, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return json.loads(text)
+                del self._memory[key]
+
+            row = self._db.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return default
+
+            text, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return default
+
+            self._touched[key] = now
+            if len(self._touched) >= self.touch_batch:
+                self._write_touches()
+                self._db.commit()
+            self._remember(key, text, expires_at)
+            self._stats["disk_hits"] += 1
+            return json.loads(text)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        text = json.dumps(value)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, text, expires_at, now),
+            )
+            self._stats["writes"] += 1
+            self._touched.pop(key, None)
+            self._write_touches()
+            self._evict_overflow()
+            self._db.commit()
+            self._remember(key, text, expires_at)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+
+    def values(self) -> List[Any]:
+        """Every unexpired value in the SQLite tier."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT value FROM entries WHERE expires_at IS NULL OR expires_at > ?", (time.time(),)
+            ).fetchall()
+        return [json.loads(value) for (value,) in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        return stats
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (
+            f"{stats['hits']} hits ({stats['memory_hits']} memory, {stats['disk_hits']} disk), "
+            f"{stats['misses']} misses, {stats['hit_rate']:.0%} hit rate, "
+            f"{stats['evictions']} evicted, {stats['entries']} stored"
+        )
+
+    def flush(self):
+        """Write buffered access times."""
+        with self._lock:
+            if self._touched and not self._closed:
+                self._write_touches()
+                self._db.commit()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._db.close()
+        atexit.unregister(self.flush)
+
+    def _remember(self, key, text, expires_at):
+        self._memory[key] = (text, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write_touches(self):
+        if self._touched:
+            self._db.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict_overflow(self):
+        count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        self._db.execute(
+            "DELETE FROM entries WHERE key IN "
+            "(SELECT key FROM entries ORDER BY expires_at IS NOT NULL AND expires_at <= ? DESC, accessed_at LIMIT ?)",
+            (time.time(), overflow),
+        )
+        self._stats["evictions"] += overflow
@@ -7,12 +7,18 @@ import os
 import sys
 import re
 import json
-import time
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+import asyncio
 from dotenv import load_dotenv
-from openai import OpenAI
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from spotify_async import AsyncSpotify, DEFAULT_MAX_CONCURRENCY
+from discography import ArtistDiscography
+from spotify_client import lazy_spotify
+from lazy_client import LazyClient
+from playlist_writer import PlaylistWriter
+from run_journal import RunJournal, journal_path
+import llm_cache
+from artist_index import default_index
+from playlist_index import default_playlist_index
 
 # Load environment variables
 load_dotenv()
@@ -23,16 +29,27 @@ SPOTIPY_REDIRECT_URI = os.getenv("SPOTIPY_REDIRECT_URI", "http://127.0.0.1:8888/
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY1")
 SCOPE = "playlist-modify-public playlist-modify-private"
 
-sp = spotipy.Spotify(
-    auth_manager=SpotifyOAuth(
+
+def _auth_manager():
+    from spotipy.oauth2 import SpotifyOAuth
+
+    return SpotifyOAuth(
         scope=SCOPE,
         client_id=SPOTIPY_CLIENT_ID,
         client_secret=SPOTIPY_CLIENT_SECRET,
         redirect_uri=SPOTIPY_REDIRECT_URI,
     )
-)
 
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+
+def _openai_client():
+    from openai import OpenAI
+
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+
+# Both built on first use so importing this module needs no credentials
+sp = lazy_spotify(_auth_manager)
+openai_client = LazyClient(_openai_client)
 
 
 def extract_artists_from_text(text):
@@ -62,16 +79,15 @@ Festival lineup text:
 """ + text
 
     try:
-        response = openai_client.chat.completions.create(
+        result = llm_cache.chat_completion(
+            openai_client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that extracts artist names from festival lineups. Return only valid JSON."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-        )
-
-        result = response.choices[0].message.content.strip()
+        ).strip()
 
         # Remove markdown code blocks if present
         if result.startswith("```"):
@@ -117,151 +133,147 @@ def artist_chooser(search_term, candidates):
 
 
 def get_artist_id(artist_name):
-    """Search for artist on Spotify and return their ID."""
+    """Return the artist's Spotify ID from the artist index, searching only on a miss."""
+    indexed = default_index().lookup(artist_name)
+    if indexed is not None:
+        return indexed["artist_id"]
     try:
         results = sp.search(q=artist_name, type="artist", limit=10)
-        candidates = results["artists"]["items"]
-        if not candidates:
-            return None
-        chosen = artist_chooser(artist_name, candidates)
-        return chosen["id"] if chosen else None
+        return choose_and_index(artist_name, results["artists"]["items"])
     except Exception as e:
         print(f"   ⚠️ Failed to search for '{artist_name}': {e}")
         return None
 
 
-def get_top_tracks(artist_id, limit=5, max_retries=3):
-    """Get artist's top tracks with retry logic."""
-    for attempt in range(max_retries):
-        try:
-            official_top = sp.artist_top_tracks(artist_id, country="US")["tracks"]
-            track_ids = [track["id"] for track in official_top[:limit] if track.get("id")]
-            if track_ids:  # Only return if we got tracks
-                return track_ids
-            # If no tracks, retry
-            if attempt < max_retries - 1:
-                time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                continue
-            else:
-                print(f"   ⚠️ Failed to get top tracks after {max_retries} attempts: {e}")
-                return []
-    return []
+def choose_and_index(artist_name, candidates):
+    """Pick from search results and record the outcome (including no match) in the index."""
+    chosen = artist_chooser(artist_name, candidates) if candidates else None
+    default_index().remember(
+        artist_name, chosen["id"] if chosen else None, candidates, chosen["name"] if chosen else None
+    )
+    return chosen["id"] if chosen else None
+
+
+def get_top_tracks(artist_id, limit=5, discography=None):
+    """Get artist's top tracks. 429s are retried by the shared rate limiter."""
+    try:
+        if discography is not None:
+            return discography.top_track_ids(limit)
+        official_top = sp.artist_top_tracks(artist_id, country="US")["tracks"]
+        return [track["id"] for track in official_top[:limit] if track.get("id")]
+    except Exception as e:
+        print(f"   ⚠️ Failed to get top tracks: {e}")
+        return []
+
+
+ALBUM_SKIP_KEYWORDS = ["remix", "edit", "rework", "version", "remastered", "compilation", "live"]
+
+
+def unique_albums_by_name(albums):
+    """Drop albums whose exact name was already seen."""
+    seen_albums = set()
+    unique_albums = []
+    for album in albums:
+        if album["name"] in seen_albums:
+            continue
+        seen_albums.add(album["name"])
+        unique_albums.append(album)
+    return unique_albums
+
+
+def pick_recent_track_ids(albums, tracklists, limit=5):
+    """Take the first `limit` tracks walking the (newest-first) albums in order."""
+    all_tracks = []
+    for album in albums:
+        all_tracks.extend(tracklists.get(album["id"], []))
+        if len(all_tracks) >= limit:
+            break
+    return [track["id"] for track in all_tracks[:limit] if track.get("id")]
 
 
-def get_recent_releases(artist_id, limit=5, max_retries=2):
-    """Get artist's recent singles and releases with retry logic."""
-    for attempt in range(max_retries):
-        try:
-            albums = sp.artist_albums(artist_id, album_type="single,album", limit=20)
-            all_tracks = []
-            seen_albums = set()
-
-            for album in albums["items"]:
-                if album["name"] in seen_albums:
-                    continue
-                seen_albums.add(album["name"])
-
-                try:
-                    tracks = sp.album_tracks(album["id"])["items"]
-                    all_tracks.extend(tracks)
-                    if len(all_tracks) >= limit:
-                        break
-                except Exception as e:
-                    continue
-
-            track_ids = [track["id"] for track in all_tracks[:limit] if track.get("id")]
+def pick_album_track_ids(albums, tracklists, min_tracks=2):
+    """Return up to 10 track IDs from the first good album, else from any of the first three."""
+    seen_album_names = set()
+
+    for album in albums:
+        album_name = album["name"].strip().lower()
+        if album_name in seen_album_names:
+            continue
+        seen_album_names.add(album_name)
+
+        # Skip remix/alternate albums
+        if any(keyword in album_name for keyword in ALBUM_SKIP_KEYWORDS):
+            continue
+
+        track_items = tracklists.get(album["id"], [])
+        if len(track_items) >= min_tracks:
+            track_ids = [t["id"] for t in track_items if t.get("id")]
+            return track_ids[:10]  # Return first 10 tracks from first good album
+
+    # Fallback: just get first available album
+    for album in albums[:3]:
+        track_items = tracklists.get(album["id"], [])
+        if len(track_items) >= min_tracks:
+            track_ids = [t["id"] for t in track_items if t.get("id")]
             if track_ids:
-                return track_ids
-
-            if attempt < max_retries - 1:
-                time.sleep(0.3 * (attempt + 1))
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(0.3 * (attempt + 1))
-                continue
-            else:
-                print(f"   ⚠️ Failed to get recent releases: {e}")
-                return []
+                return track_ids[:10]
+
     return []
 
 
-def get_most_popular_album_tracks(artist_id, min_tracks=2, max_retries=2):
-    """Get tracks from the artist's first good album with retry logic."""
-    for attempt in range(max_retries):
-        try:
-            albums = sp.artist_albums(artist_id, album_type="album", limit=10)
-            seen_album_names = set()
-
-            for album in albums["items"]:
-                album_name = album["name"].strip().lower()
-                if album_name in seen_album_names:
-                    continue
-                seen_album_names.add(album_name)
-
-                # Skip remix/alternate albums
-                if any(keyword in album_name for keyword in ["remix", "edit", "rework", "version", "remastered", "compilation", "live"]):
-                    continue
-
-                try:
-                    track_items = sp.album_tracks(album["id"])["items"]
-
-                    if len(track_items) >= min_tracks:
-                        track_ids = [t["id"] for t in track_items if t.get("id")]
-                        return track_ids[:10]  # Return first 10 tracks from first good album
-                except:
-                    continue
-
-            # Fallback: just get first available album
-            for album in albums["items"][:3]:
-                try:
-                    track_items = sp.album_tracks(album["id"])["items"]
-                    if len(track_items) >= min_tracks:
-                        track_ids = [t["id"] for t in track_items if t.get("id")]
-                        if track_ids:
-                            return track_ids[:10]
-                except:
-                    continue
-
-            if attempt < max_retries - 1:
-                time.sleep(0.3 * (attempt + 1))
-                continue
-            return []
-
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(0.3 * (attempt + 1))
-                continue
-            else:
-                print(f"   ⚠️ Failed to get album tracks: {e}")
-                return []
-    return []
+def get_recent_releases(artist_id, limit=5, discography=None):
+    """Get artist's recent singles and releases."""
+    try:
+        discography = discography or ArtistDiscography.load(sp, artist_id)
+        unique_albums = unique_albums_by_name(discography.of_type("album", "single", limit=20))
+        tracklists = discography.tracklists(album["id"] for album in unique_albums)
+        return pick_recent_track_ids(unique_albums, tracklists, limit)
+    except Exception as e:
+        print(f"   ⚠️ Failed to get recent releases: {e}")
+        return []
+
+
+def get_most_popular_album_tracks(artist_id, min_tracks=2, discography=None):
+    """Get tracks from the artist's first good album."""
+    try:
+        discography = discography or ArtistDiscography.load(sp, artist_id)
+        albums = discography.of_type("album", limit=10)
+        tracklists = discography.tracklists(album["id"] for album in albums)
+        return pick_album_track_ids(albums, tracklists, min_tracks)
+    except Exception as e:
+        print(f"   ⚠️ Failed to get album tracks: {e}")
+        return []
+
+
+def merge_track_selections(top_tracks, recent_tracks, album_tracks):
+    """Combine the three selections, dropping duplicates while keeping order."""
+    all_tracks = []
+    seen = set()
+    for track_id in top_tracks + recent_tracks + album_tracks:
+        if track_id and track_id not in seen:
+            all_tracks.append(track_id)
+            seen.add(track_id)
+
+    print(f"   ✓ Found {len(all_tracks)} tracks (top: {len(top_tracks)}, recent: {len(recent_tracks)}, album: {len(album_tracks)})")
+    return all_tracks
 
 
 def get_representative_tracks(artist_id):
     """Get comprehensive track selection: top tracks, recent releases, and album."""
     try:
+        # One snapshot of top tracks, releases and tracklists feeds all three selectors
+        discography = ArtistDiscography.load(sp, artist_id)
+
         # Get top tracks (popular hits)
-        top_tracks = get_top_tracks(artist_id, limit=5)
+        top_tracks = get_top_tracks(artist_id, limit=5, discography=discography)
 
         # Get recent releases (new material)
-        recent_tracks = get_recent_releases(artist_id, limit=5)
+        recent_tracks = get_recent_releases(artist_id, limit=5, discography=discography)
 
         # Get tracks from an album (deep cut representation)
-        album_tracks = get_most_popular_album_tracks(artist_id, min_tracks=3)
+        album_tracks = get_most_popular_album_tracks(artist_id, min_tracks=3, discography=discography)
 
-        # Combine all tracks and remove duplicates
-        all_tracks = []
-        seen = set()
-        for track_id in top_tracks + recent_tracks + album_tracks:
-            if track_id and track_id not in seen:
-                all_tracks.append(track_id)
-                seen.add(track_id)
-
-        print(f"   ✓ Found {len(all_tracks)} tracks (top: {len(top_tracks)}, recent: {len(recent_tracks)}, album: {len(album_tracks)})")
-        return all_tracks
+        return merge_track_selections(top_tracks, recent_tracks, album_tracks)
 
     except Exception as e:
         print(f"   ⚠️ Failed to get tracks: {e}")
@@ -269,17 +281,16 @@ def get_representative_tracks(artist_id):
 
 
 def get_or_create_playlist(user_id, playlist_name):
-    """Get existing playlist or create new one."""
+    """Get existing playlist (searching all of the user's playlists) or create new one."""
     try:
-        normalized_name = playlist_name.strip().lower()
-        playlists = sp.current_user_playlists(limit=50)
-
-        for playlist in playlists["items"]:
-            if playlist and playlist.get("name", "").strip().lower() == normalized_name:
-                print(f"\nℹ️  Found existing playlist: {playlist['name']}")
-                return playlist["id"], playlist["external_urls"]["spotify"]
+        playlists = default_playlist_index()
+        playlist = playlists.find(sp, user_id, playlist_name)
+        if playlist:
+            print(f"\nℹ️  Found existing playlist: {playlist['name']}")
+            return playlist["id"], playlist["url"]
 
         new_playlist = sp.user_playlist_create(user=user_id, name=playlist_name, public=False)
+        playlists.add(user_id, new_playlist)
         print(f"\n🆕 Created new playlist: {playlist_name}")
         return new_playlist["id"], new_playlist["external_urls"]["spotify"]
 
@@ -291,33 +302,29 @@ def get_or_create_playlist(user_id, playlist_name):
 def add_tracks_to_playlist(playlist_id, new_track_ids):
     """Add tracks to playlist, avoiding duplicates."""
     try:
-        # Get existing tracks
-        existing = sp.playlist_tracks(playlist_id, fields="items.track.id")
-        existing_ids = {item["track"]["id"] for item in existing["items"] if item.get("track")}
-
-        # Filter new tracks
-        valid_new = [tid for tid in new_track_ids if tid and tid not in existing_ids]
-
-        if valid_new:
-            # Add in batches of 100
-            for i in range(0, len(valid_new), 100):
-                batch = valid_new[i:i+100]
-                sp.playlist_add_items(playlist_id, batch)
-            return len(valid_new)
-        return 0
+        with PlaylistWriter(sp, playlist_id) as writer:
+            return writer.submit(new_track_ids)
 
     except Exception as e:
         print(f"   ⚠️ Failed to add tracks: {e}")
         return 0
 
 
-def process_artist(artist_name, index, total, playlist_id):
-    """Process a single artist and return results."""
+def process_artist(artist_name, index, total, writer, journal=None):
+    """Process a single artist and queue its tracks on the playlist writer."""
     try:
         print(f"\n[{index}/{total}] {artist_name}")
 
+        # Already selected by an earlier run: only replay what wasn't committed
+        if journal and artist_name in journal.selected:
+            return replay_artist(artist_name, journal, writer)
+
         # Search for artist
-        artist_id = get_artist_id(artist_name)
+        artist_id = journal.resolved.get(artist_name) if journal else None
+        if not artist_id:
+            artist_id = get_artist_id(artist_name)
+            if artist_id and journal:
+                journal.record_resolved(artist_name, artist_id)
         if not artist_id:
             print(f"   ❌ Not found on Spotify")
             return {"name": artist_name, "success": False, "tracks_added": 0}
@@ -328,11 +335,13 @@ def process_artist(artist_name, index, total, playlist_id):
         if not tracks:
             print(f"   ⚠️ No tracks found")
             return {"name": artist_name, "success": False, "tracks_added": 0}
+        if journal:
+            journal.record_selected(artist_name, tracks)
 
-        # Add to playlist
-        added = add_tracks_to_playlist(playlist_id, tracks)
+        # Queue for the playlist writer
+        added = writer.submit(tracks)
         if added > 0:
-            print(f"   ✅ Added {added} track(s)")
+            print(f"   ✅ Queued {added} track(s)")
         else:
             print(f"   ℹ️  Tracks already in playlist")
 
@@ -343,57 +352,212 @@ def process_artist(artist_name, index, total, playlist_id):
         return {"name": artist_name, "success": False, "tracks_added": 0}
 
 
-def main(lineup_text, playlist_name="Pop-Kultur Festival 2025"):
-    """Create playlist from festival lineup with concurrent processing."""
+def replay_artist(artist_name, journal, writer):
+    """Resubmit a journaled artist's tracks that never made it into the playlist."""
+    pending = journal.uncommitted(journal.selected[artist_name]["track_ids"])
+    added = writer.submit(pending)
+    if added > 0:
+        print(f"   ↩️  Resumed: re-queued {added} uncommitted track(s)")
+    else:
+        print(f"   ⏭️  Resumed: already done")
+    return {"name": artist_name, "success": True, "tracks_added": added}
+
+
+def process_lineup_threaded(artists, writer, max_workers=5, journal=None):
+    """Process artists on a thread pool, one artist per worker."""
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Submit all tasks
+        future_to_artist = {
+            executor.submit(process_artist, artist, i+1, len(artists), writer, journal): artist
+            for i, artist in enumerate(artists)
+        }
+
+        # Collect results as they complete
+        for future in as_completed(future_to_artist):
+            results.append(future.result())
+    return results
+
+
+async def get_artist_id_async(asp, artist_name):
+    """Async `get_artist_id`."""
+    indexed = default_index().lookup(artist_name)
+    if indexed is not None:
+        return indexed["artist_id"]
+    try:
+        results = await asp.search(q=artist_name, type="artist", limit=10)
+        return choose_and_index(artist_name, results["artists"]["items"])
+    except Exception as e:
+        print(f"   ⚠️ Failed to search for '{artist_name}': {e}")
+        return None
+
+
+async def get_recent_releases_async(asp, artist_id, limit=5, discography=None):
+    """Async `get_recent_releases`, fetching every album batch concurrently."""
+    try:
+        discography = discography or await ArtistDiscography.load_async(asp, artist_id)
+        unique_albums = unique_albums_by_name(discography.of_type("album", "single", limit=20))
+        tracklists = await discography.tracklists_async(album["id"] for album in unique_albums)
+        return pick_recent_track_ids(unique_albums, tracklists, limit)
+    except Exception as e:
+        print(f"   ⚠️ Failed to get recent releases: {e}")
+        return []
+
+
+async def get_most_popular_album_tracks_async(asp, artist_id, min_tracks=2, discography=None):
+    """Async `get_most_popular_album_tracks`."""
+    try:
+        discography = discography or await ArtistDiscography.load_async(asp, artist_id)
+        albums = discography.of_type("album", limit=10)
+        tracklists = await discography.tracklists_async(album["id"] for album in albums)
+        return pick_album_track_ids(albums, tracklists, min_tracks)
+    except Exception as e:
+        print(f"   ⚠️ Failed to get album tracks: {e}")
+        return []
+
+
+async def get_representative_tracks_async(asp, artist_id):
+    """
+    Load the artist's discography snapshot, then run the selectors on it concurrently.
+
+    Albums both selectors read are fetched once; the second waits on the first's load.
+    """
+    try:
+        discography = await ArtistDiscography.load_async(asp, artist_id)
+    except Exception as e:
+        print(f"   ⚠️ Failed to get tracks: {e}")
+        return []
+    top_tracks = get_top_tracks(artist_id, limit=5, discography=discography)
+    recent_tracks, album_tracks = await asyncio.gather(
+        get_recent_releases_async(asp, artist_id, limit=5, discography=discography),
+        get_most_popular_album_tracks_async(asp, artist_id, min_tracks=3, discography=discography),
+    )
+    return merge_track_selections(top_tracks, recent_tracks, album_tracks)
+
+
+async def process_artist_async(asp, artist_name, index, total, writer, journal=None):
+    """Async `process_artist`."""
+    try:
+        if journal and artist_name in journal.selected:
+            print(f"\n[{index}/{total}] {artist_name}")
+            return replay_artist(artist_name, journal, writer)
+
+        artist_id = journal.resolved.get(artist_name) if journal else None
+        if not artist_id:
+            artist_id = await get_artist_id_async(asp, artist_name)
+            if artist_id and journal:
+                journal.record_resolved(artist_name, artist_id)
+        print(f"\n[{index}/{total}] {artist_name}")
+        if not artist_id:
+            print(f"   ❌ Not found on Spotify")
+            return {"name": artist_name, "success": False, "tracks_added": 0}
+
+        tracks = await get_representative_tracks_async(asp, artist_id)
+
+        if not tracks:
+            print(f"   ⚠️ No tracks found")
+            return {"name": artist_name, "success": False, "tracks_added": 0}
+        if journal:
+            journal.record_selected(artist_name, tracks)
+
+        # Queue for the playlist writer (in-memory dedupe, never blocks on the API)
+        added = writer.submit(tracks)
+        if added > 0:
+            print(f"   ✅ Queued {added} track(s) from {artist_name}")
+        else:
+            print(f"   ℹ️  Tracks from {artist_name} already in playlist")
+
+        return {"name": artist_name, "success": True, "tracks_added": added}
+
+    except Exception as e:
+        print(f"   ❌ Error processing {artist_name}: {e}")
+        return {"name": artist_name, "success": False, "tracks_added": 0}
+
+
+async def process_lineup_async(artists, writer, max_concurrency=DEFAULT_MAX_CONCURRENCY, journal=None):
+    """
+    Process every artist at once on the asyncio engine.
+
+    All artists, their selectors and their album fetches run concurrently;
+    `max_concurrency` caps the number of Spotify requests in flight overall.
+    """
+    async with AsyncSpotify(sp, max_concurrency=max_concurrency) as asp:
+        return await asyncio.gather(*(
+            process_artist_async(asp, artist, i+1, len(artists), writer, journal)
+            for i, artist in enumerate(artists)
+        ))
+
+
+def main(lineup_text, playlist_name="Pop-Kultur Festival 2025", engine="async", resume=False):
+    """
+    Create playlist from festival lineup with concurrent processing.
+
+    Progress is journaled as it happens; `resume=True` picks up the last run
+    of the same lineup and playlist instead of starting over.
+    """
     try:
         print("🎵 Pop-Kultur Festival 2025 - Playlist Generator\n")
         print("=" * 60)
 
-        # Extract artists from text
-        print("\n📋 Extracting artists from lineup...")
-        artists = extract_artists_from_text(lineup_text)
-        print(f"✓ Found {len(artists)} artists\n")
-
-        # Create/get playlist
-        user_id = sp.current_user()["id"]
-        playlist_id, playlist_url = get_or_create_playlist(user_id, playlist_name)
-
-        # Process artists concurrently
-        successful = 0
-        failed = []
-        total_tracks_added = 0
-
-        # Use ThreadPoolExecutor for concurrent processing
-        max_workers = 5  # Process 5 artists at a time to avoid API rate limits
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_artist = {
-                executor.submit(process_artist, artist, i+1, len(artists), playlist_id): artist
-                for i, artist in enumerate(artists)
-            }
-
-            # Process results as they complete
-            for future in as_completed(future_to_artist):
-                result = future.result()
+        # Keyed on the raw lineup: a fresh extraction on resume may not match the last one
+        journal = RunJournal(journal_path("festival", playlist_name, lineup_text), resume=resume)
+        with journal:
+            if resume:
+                print(f"↩️  Resuming: {journal.summary()}")
+
+            # Extract artists from text
+            if journal.artists:
+                artists = journal.artists
+                print(f"\n📋 Reusing {len(artists)} artists extracted by the last run\n")
+            else:
+                print("\n📋 Extracting artists from lineup...")
+                artists = extract_artists_from_text(lineup_text)
+                if artists:  # a failed extraction is retried on resume, not replayed
+                    journal.record_artists(artists)
+                print(f"✓ Found {len(artists)} artists\n")
+
+            # Create/get playlist
+            if journal.playlist:
+                playlist_id, playlist_url = journal.playlist["playlist_id"], journal.playlist["playlist_url"]
+            else:
+                user_id = sp.current_user()["id"]
+                playlist_id, playlist_url = get_or_create_playlist(user_id, playlist_name)
+                journal.record_playlist(playlist_id, playlist_url)
+
+            # Process artists concurrently; a single writer commits their tracks
+            with PlaylistWriter(sp, playlist_id, on_commit=journal.record_committed) as writer:
+                if engine == "async":
+                    results = asyncio.run(process_lineup_async(artists, writer, journal=journal))
+                else:
+                    results = process_lineup_threaded(artists, writer, journal=journal)
+
+            successful = 0
+            failed = []
+            for result in results:
                 if result["success"]:
                     successful += 1
-                    total_tracks_added += result["tracks_added"]
                 else:
                     failed.append(result["name"])
 
-        # Summary
-        print(f"\n{'='*60}")
-        print(f"\n✨ Complete!")
-        print(f"   ✓ {successful} artists processed successfully")
-        print(f"   ✓ {total_tracks_added} tracks added to playlist")
-        if failed:
-            print(f"   ⚠️  {len(failed)} artists not found:")
-            for name in failed[:10]:  # Show first 10
-                print(f"      - {name}")
-            if len(failed) > 10:
-                print(f"      ... and {len(failed) - 10} more")
-        print(f"\n🔗 Playlist URL: {playlist_url}\n")
+            # Summary
+            print(f"\n{'='*60}")
+            print(f"\n✨ Complete!")
+            print(f"   ✓ {successful} artists processed successfully")
+            print(f"   ✓ {writer.written} tracks added to playlist in {writer.writes} write(s)")
+            if writer.failed:
+                print(f"   ⚠️  {len(writer.failed)} tracks could not be added")
+            if failed:
+                print(f"   ⚠️  {len(failed)} artists not found:")
+                for name in failed[:10]:  # Show first 10
+                    print(f"      - {name}")
+                if len(failed) > 10:
+                    print(f"      ... and {len(failed) - 10} more")
+            print(f"\n🔗 Playlist URL: {playlist_url}")
+            print(f"🗄️  Spotify cache: {sp.cache.summary()}")
+            print(f"🚦 Spotify rate limiter: {sp.limiter.summary()}")
+            print(f"🤖 LLM cache: {llm_cache.summary()}")
+            print(f"🎤 Artist index: {default_index().summary()}")
+            print(f"📓 Journal: {journal.summary()}\n")
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -575,5 +739,8 @@ Zoon Phonanta
 #pklive
 """
 
-    playlist_name = sys.argv[1] if len(sys.argv) > 1 else "Pop-Kultur Festival 2025"
-    main(LINEUP, playlist_name)
+    # --threads falls back to the ThreadPoolExecutor engine; --resume continues an interrupted run
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    engine = "threads" if "--threads" in sys.argv[1:] else "async"
+    playlist_name = args[0] if args else "Pop-Kultur Festival 2025"
+    main(LINEUP, playlist_name, engine=engine, resume="--resume" in sys.argv[1:])
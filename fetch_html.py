@@ -2,11 +2,14 @@ import os
 import re
 import sys
 import logging
-import requests
-from bs4 import BeautifulSoup
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+import html_cache
+import metrics
+from lazy_client import LazyClient
+from track_extractor import clean_redundant_artist_from_title, extract_tracks_with_strategy
+from track_sinks import open_sink
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,34 +20,141 @@ SPOTIPY_REDIRECT_URI = os.getenv("SPOTIPY_REDIRECT_URI", "http://127.0.0.1:8888/
 BRIGHTDATA_API_KEY = os.getenv("BRIGHT_DATA_API_KEY")
 BRIGHTDATA_ZONE = os.getenv("BRIGHTDATA_ZONE")
 SCOPE = "playlist-modify-public playlist-modify-private"
+BRIGHTDATA_REQUEST_URL = "https://api.brightdata.com/request"
+DEFAULT_MAX_IN_FLIGHT = 8
+# Not track_extractor's tracks_output.csv, so a bulk run never overwrites it or its manifest
+DEFAULT_BULK_OUTPUT = "fetched_pages.csv"
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
-    scope=SCOPE,
-    client_id=SPOTIPY_CLIENT_ID,
-    client_secret=SPOTIPY_CLIENT_SECRET,
-    redirect_uri=SPOTIPY_REDIRECT_URI,
-))
+def _spotify():
+    import spotipy
+    from spotipy.oauth2 import SpotifyOAuth
 
-def fetch_html(url):
-    logger.info(f"🌐 Fetching rendered HTML via Bright Data for {url}")
-    response = requests.post(
-        "https://api.brightdata.com/request",
-        headers={"Authorization": f"Bearer {BRIGHTDATA_API_KEY}"},
-        json={"zone": BRIGHTDATA_ZONE, "url": url, "format": "raw", "render": True}
+    return spotipy.Spotify(auth_manager=SpotifyOAuth(
+        scope=SCOPE,
+        client_id=SPOTIPY_CLIENT_ID,
+        client_secret=SPOTIPY_CLIENT_SECRET,
+        redirect_uri=SPOTIPY_REDIRECT_URI,
+    ))
+
+# Built on first use so importing this module needs no credentials
+sp = LazyClient(_spotify)
+
+_session = None
+_session_lock = threading.Lock()
+
+def brightdata_session(pool_size=DEFAULT_MAX_IN_FLIGHT):
+    """
+    Keep-alive session for Bright Data with one pooled connection per in-flight request.
+
+    Rendering is slow and occasionally flaky, so 429 and 5xx responses and
+    dropped connections are retried per URL with backoff, honouring
+    Retry-After.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=4,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["POST"]),
+        backoff_factor=1.0,
+        respect_retry_after_header=True,
+        raise_on_status=False,
     )
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {BRIGHTDATA_API_KEY}"
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+def default_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = brightdata_session()
+        return _session
+
+def fetch_html(url, refresh=False, session=None):
+    cache = html_cache.default_cache()
+    html = None if refresh else cache.get(url, render=True)
+    if html is not None:
+        metrics.record("brightdata", "request", "cache_hit")
+        logger.info(f"♻️ Using cached HTML for {url}")
+        return html
+
+    import requests
+
+    logger.info(f"🌐 Fetching rendered HTML via Bright Data for {url}")
+    try:
+        with metrics.timed("brightdata", "request") as call:
+            response = (session or default_session()).post(
+                BRIGHTDATA_REQUEST_URL,
+                json={"zone": BRIGHTDATA_ZONE, "url": url, "format": "raw", "render": True}
+            )
+            call.status = response.status_code
+        metrics.record_http_retries("brightdata", "request", response)
+    except requests.RequestException as e:
+        logger.error(f"❌ Bright Data fetch failed for {url}: {e}")
+        return None
     if response.status_code == 200:
         html = response.text
-        with open("brightdata_tracklist.html", "w", encoding="utf-8") as f:
-            f.write(html)
-        logger.info("✅ HTML saved to brightdata_tracklist.html")
+        path = cache.set(url, html, render=True)
+        logger.info(f"✅ HTML cached at {path}")
         return html
     else:
         logger.error(f"❌ Bright Data fetch failed: {response.status_code}\n{response.text[:300]}")
         return None
 
+def fetch_many(urls, max_in_flight=DEFAULT_MAX_IN_FLIGHT, refresh=False):
+    """
+    Fetch pages concurrently over one pooled session.
+
+    Yields (url, html) pairs as each fetch finishes, so callers can start
+    processing pages while the rest are still rendering. html is None for
+    URLs that failed after retries.
+    """
+    session = brightdata_session(pool_size=max_in_flight)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        futures = {pool.submit(fetch_html, url, refresh, session): url for url in urls}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def read_urls(path):
+    """URLs from a file, or stdin for "-"; blank lines and # comments are skipped."""
+    handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        urls = [line.strip() for line in handle if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return list(dict.fromkeys(urls))
+
+def bulk_extract(urls, output_path, max_in_flight=DEFAULT_MAX_IN_FLIGHT, refresh=False):
+    """Fetch every URL and extract its tracks as soon as the page lands, then write them to output_path."""
+    tracks_by_url = {}
+    failed = []
+    for done, (url, html) in enumerate(fetch_many(urls, max_in_flight, refresh), start=1):
+        if html is None:
+            failed.append(url)
+            continue
+        tracks, strategy = extract_tracks_with_strategy(html, url)
+        tracks_by_url[url] = clean_redundant_artist_from_title(tracks)
+        logger.info(f"[{done}/{len(urls)}] 🎵 {len(tracks)} tracks ({strategy}) from {url}")
+
+    # Input order, not completion order, so reruns produce the same file
+    all_tracks = [track for url in urls for track in tracks_by_url.get(url, [])]
+    open_sink(output_path).write(all_tracks)
+    print(f"✅ Saved {len(all_tracks)} tracks from {len(tracks_by_url)}/{len(urls)} pages to {output_path}")
+    if failed:
+        print(f"⚠️ {len(failed)} URLs failed:")
+        for url in failed:
+            print(f"   - {url}")
+    return all_tracks
+
 # def extract_all_tracks(html):
 #     soup = BeautifulSoup(html, "html.parser")
 #     tracks = []
@@ -128,8 +238,8 @@ def fetch_html(url):
 #     else:
 #         print("ℹ️ No new tracks to add — all are already in the playlist.")
 
-def main(url):
-    html = fetch_html(url)
+def main(url, refresh=False):
+    html = fetch_html(url, refresh)
     if not html:
         return
 
@@ -153,7 +263,20 @@ def main(url):
     # print(f"\n🔗 Final playlist: {playlist_url}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 tracklist_to_spotify.py <1001tracklists_url>")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fetch rendered 1001tracklists pages via Bright Data")
+    parser.add_argument("url", nargs="?", help="Single tracklist URL")
+    parser.add_argument("--urls", metavar="FILE", help="Bulk mode: file with one URL per line, or - for stdin")
+    parser.add_argument("--output", default=DEFAULT_BULK_OUTPUT, help=f"Bulk mode output (.csv, .sqlite, .parquet; default: {DEFAULT_BULK_OUTPUT})")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT, help="Concurrent Bright Data requests in bulk mode")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached pages and fetch again")
+    args = parser.parse_args()
+
+    if args.urls:
+        bulk_extract(read_urls(args.urls), args.output, args.max_in_flight, args.refresh)
+    elif args.url:
+        main(args.url, refresh=args.refresh)
+    else:
+        parser.print_usage()
         sys.exit(1)
-    main(sys.argv[1])
@@ -0,0 +1,261 @@
+"""
+On-disk cache for rendered pages fetched through Bright Data.
+
+Each page is stored under a name derived from sha256(render mode + URL), so
+re-fetching a known tracklist costs no request and no render credit, and two
+runs fetching different URLs never touch the same file. Pages are compressed
+with zstd when the `zstandard` package is installed and gzip otherwise;
+either format is readable regardless of which one wrote it.
+
+Freshness is the file's mtime (set when the page was fetched) against
+HTML_CACHE_TTL. Reads bump the atime, and when the cache grows past
+HTML_CACHE_MAX_MB the least recently read pages are deleted first, down to
+EVICT_TO of the cap. The size is a running count from one directory scan,
+so writes don't walk the cache; it is rescanned when the count crosses the
+cap, and every RESCAN_WRITES writes to pick up pages other processes added.
+Writes go to a temp file and are renamed into place, so readers never see
+half a page.
+
+Usage:
+    python html_cache.py            # print size and entry count
+    python html_cache.py --clear    # delete every cached page
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_CACHE_DIR = ".html_cache"
+DEFAULT_MAX_MB = 500
+DEFAULT_TTL = 7 * 24 * 3600
+EXTENSIONS = (".html.zst", ".html.gz")
+RESCAN_WRITES = 500
+# Evict down to this share of the cap, so a full cache isn't rescanned on every write
+EVICT_TO = 0.9
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, extension: str) -> bytes:
+    if extension == ".html.zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def page_key(url: str, render: bool = True) -> str:
+    mode = "render" if render else "raw"
+    return hashlib.sha256(f"{mode}\n{url}".encode("utf-8")).hexdigest()
+
+
+class HtmlCache:
+    """Compressed, TTL-checked, size-capped page store in a directory."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024, ttl: Optional[float] = DEFAULT_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "writes": 0, "evictions": 0}
+        self._usage = None  # {"entries", "bytes"} since the last scan, None until the first
+        self._writes_since_scan = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, url: str, render: bool = True) -> str:
+        """Where this page lives on disk (zst or gz, depending on what's installed)."""
+        key = page_key(url, render)
+        extension = EXTENSIONS[0] if zstandard is not None else EXTENSIONS[1]
+        return os.path.join(self.directory, key[:2], key + extension)
+
+    def get(self, url: str, render: bool = True, max_age: Optional[float] = None) -> Optional[str]:
+        """
+        Return the cached page if it is fresh enough, else None.
+
+        Args:
+            url (str): Page URL.
+            render (bool): Whether the page was fetched with JavaScript rendering.
+            max_age (float): Override the cache TTL in seconds for this lookup.
+
+        Returns:
+            str: The page HTML, or None on a miss or a stale entry.
+        """
+        max_age = self.ttl if max_age is None else max_age
+        key = page_key(url, render)
+        for extension in EXTENSIONS:
+            path = os.path.join(self.directory, key[:2], key + extension)
+            try:
+                with open(path, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    if max_age is not None and time.time() - stat.st_mtime > max_age:
+                        self._count("stale")
+                        continue
+                    data = f.read()
+                html = _decompress(data, extension).decode("utf-8")
+                # atime is the LRU clock; keep mtime as the fetch time
+                os.utime(path, (time.time(), stat.st_mtime))
+            except FileNotFoundError:
+                continue
+            except (OSError, EOFError, RuntimeError, UnicodeDecodeError, gzip.BadGzipFile):
+                continue
+            self._count("hits")
+            return html
+        self._count("misses")
+        return None
+
+    def set(self, url: str, html: str, render: bool = True) -> str:
+        """Store a freshly fetched page and return its path."""
+        path = self.path_for(url, render)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        data = _compress(html.encode("utf-8"))
+        old_size = self._size(path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self._stats["writes"] += 1
+            self._writes_since_scan += 1
+            if self._usage is not None:
+                self._usage["entries"] += old_size is None
+                self._usage["bytes"] += len(data) - (old_size or 0)
+            needs_scan = (
+                self._usage is None
+                or self._usage["bytes"] > self.max_bytes
+                or self._writes_since_scan >= RESCAN_WRITES
+            )
+        if needs_scan:
+            self.evict()
+        return path
+
+    def delete(self, url: str, render: bool = True):
+        key = page_key(url, render)
+        for extension in EXTENSIONS:
+            path = os.path.join(self.directory, key[:2], key + extension)
+            size = self._size(path)
+            if size is not None:
+                os.remove(path)
+                self._untrack(size)
+
+    def clear(self):
+        for path, _ in self._entries():
+            os.remove(path)
+        with self._lock:
+            self._usage = {"entries": 0, "bytes": 0}
+            self._writes_since_scan = 0
+
+    def evict(self):
+        """Rescan the directory; if over max_bytes, delete least recently read pages down to EVICT_TO of it."""
+        entries = self._entries()
+        count = len(entries)
+        total = sum(stat.st_size for _, stat in entries)
+        if total > self.max_bytes:
+            for path, stat in sorted(entries, key=lambda entry: entry[1].st_atime):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                count -= 1
+                total -= stat.st_size
+                self._count("evictions")
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+        with self._lock:
+            self._usage = {"entries": count, "bytes": total}
+            self._writes_since_scan = 0
+
+    def stats(self) -> Dict[str, Any]:
+        if self._usage is None:
+            entries = self._entries()
+            with self._lock:
+                self._usage = {"entries": len(entries), "bytes": sum(stat.st_size for _, stat in entries)}
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(self._usage)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (
+            f"{stats['hits']} hits, {stats['misses']} misses ({stats['stale']} stale), "
+            f"{stats['hit_rate']:.0%} hit rate, {stats['evictions']} evicted, "
+            f"{stats['entries']} pages / {stats['bytes'] / 1e6:.1f} MB stored"
+        )
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(EXTENSIONS):
+                    path = os.path.join(root, name)
+                    try:
+                        entries.append((path, os.stat(path)))
+                    except FileNotFoundError:
+                        pass
+        return entries
+
+    @staticmethod
+    def _size(path) -> Optional[int]:
+        try:
+            return os.stat(path).st_size
+        except FileNotFoundError:
+            return None
+
+    def _untrack(self, size):
+        with self._lock:
+            if self._usage is not None:
+                self._usage["entries"] -= 1
+                self._usage["bytes"] -= size
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+
+def default_cache() -> HtmlCache:
+    """Process-wide page cache (HTML_CACHE_DIR, HTML_CACHE_MAX_MB, HTML_CACHE_TTL)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HtmlCache(
+                os.getenv("HTML_CACHE_DIR", DEFAULT_CACHE_DIR),
+                max_bytes=int(float(os.getenv("HTML_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+                ttl=float(os.getenv("HTML_CACHE_TTL", DEFAULT_TTL)),
+            )
+        return _cache
+
+
+if __name__ == "__main__":
+    import sys
+
+    cache = default_cache()
+    if "--clear" in sys.argv[1:]:
+        cache.clear()
+        print("🧹 HTML cache cleared")
+    else:
+        stats = cache.stats()
+        print(f"🗄️  {stats['entries']} cached pages, {stats['bytes'] / 1e6:.1f} MB in {cache.directory}")
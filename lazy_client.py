@@ -0,0 +1,39 @@
+"""
+Deferred construction for module-level API clients.
+
+Modules keep their `sp = ...` / `client = ...` globals, but bind them to a
+`LazyClient` that only runs the factory (and whatever heavy imports and
+credential checks it does) the first time an attribute is used. Importing a
+module for one helper, or running `--help`, never touches spotipy or openai.
+"""
+
+import threading
+from typing import Any, Callable
+
+
+class LazyClient:
+    """Proxy that builds the real client with `factory` on first attribute access."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._client is not None
+
+    def resolve(self) -> Any:
+        """Return the real client, building it once (thread-safe)."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, name):
+        # Only called for names not set in __init__, i.e. the client's own API
+        if name in ("_factory", "_client", "_lock"):
+            # Half-built proxy (copy/pickle); don't recurse into resolve()
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
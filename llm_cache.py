@@ -0,0 +1,112 @@
+"""
+Content-addressed cache for OpenAI chat completions.
+
+Responses are keyed by a hash of (model, messages, temperature), so the same
+prompt for the same track title or lineup is answered from disk instead of
+costing another round trip and another batch of tokens. Backed by a
+size-capped `DiskCache`.
+
+Usage:
+    python llm_cache.py            # print cache size and token totals
+    python llm_cache.py --clear    # drop every cached completion
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import metrics
+from disk_cache import DiskCache
+
+DEFAULT_CACHE_PATH = ".llm_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 20000
+
+_cache = None
+_cache_lock = threading.Lock()
+_tokens_saved = 0
+_tokens_saved_lock = threading.Lock()
+
+
+def default_cache() -> DiskCache:
+    """Process-wide LLM response cache (LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache(
+                os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+        return _cache
+
+
+def completion_key(model: str, messages: list, temperature: float) -> str:
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chat_completion(client, model: str, messages: list, temperature: float) -> str:
+    """
+    Return the message content of a chat completion, from cache when possible.
+
+    Args:
+        client: OpenAI client.
+        model (str): Model name.
+        messages (list): Chat messages.
+        temperature (float): Sampling temperature.
+
+    Returns:
+        str: The first choice's message content.
+    """
+    global _tokens_saved
+    cache = default_cache()
+    key = completion_key(model, messages, temperature)
+
+    cached = cache.get(key)
+    if cached is not None:
+        metrics.record("openai", model, "cache_hit")
+        with _tokens_saved_lock:
+            _tokens_saved += cached.get("total_tokens", 0)
+        return cached["content"]
+
+    with metrics.timed("openai", model):
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+        )
+    content = response.choices[0].message.content
+    usage = getattr(response, "usage", None)
+    metrics.record_tokens(
+        model,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+    cache.set(key, {
+        "content": content,
+        "model": model,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    })
+    return content
+
+
+def summary() -> str:
+    """One-line hit-rate report for this process."""
+    return f"{default_cache().summary()}, ~{_tokens_saved} tokens saved"
+
+
+if __name__ == "__main__":
+    import sys
+
+    cache = default_cache()
+    if "--clear" in sys.argv[1:]:
+        cache.clear()
+        print("🧹 LLM cache cleared")
+    else:
+        entries = cache.values()
+        stored_tokens = sum(entry.get("total_tokens", 0) for entry in entries)
+        print(f"🗄️  {len(entries)} cached completions covering ~{stored_tokens} tokens in {cache.path}")
@@ -233,9 +233,13 @@
 
 import os
 import sys
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
 from dotenv import load_dotenv
+from spotify_batch import get_track_popularity
+from discography import ArtistDiscography
+from spotify_client import lazy_spotify
+from run_journal import RunJournal, journal_path
+from artist_index import default_index
+from playlist_index import default_playlist_index
 
 # Load environment variables from .env file
 load_dotenv()
@@ -247,14 +251,20 @@ SPOTIPY_REDIRECT_URI = os.getenv(
 )
 SCOPE = "playlist-modify-public playlist-modify-private"
 
-sp = spotipy.Spotify(
-    auth_manager=SpotifyOAuth(
+
+def _auth_manager():
+    from spotipy.oauth2 import SpotifyOAuth
+
+    return SpotifyOAuth(
         scope=SCOPE,
         client_id=SPOTIPY_CLIENT_ID,
         client_secret=SPOTIPY_CLIENT_SECRET,
         redirect_uri=SPOTIPY_REDIRECT_URI,
     )
-)
+
+
+# Built on first use so importing this module needs no credentials
+sp = lazy_spotify(_auth_manager)
 
 
 def artist_chooser(search_term, candidates):
@@ -279,20 +289,28 @@ def artist_chooser(search_term, candidates):
 
 
 def get_artist_id(artist_name):
+    indexed = default_index().lookup(artist_name)
+    if indexed is not None:
+        if indexed["artist_id"]:
+            print(f"🎤 '{artist_name}' → {indexed.get('name') or indexed['artist_id']} (from artist index)")
+        return indexed["artist_id"]
     try:
         results = sp.search(q=artist_name, type="artist", limit=5)
         candidates = results["artists"]["items"]
-        if not candidates:
-            return None
-        chosen = artist_chooser(artist_name, candidates)
+        chosen = artist_chooser(artist_name, candidates) if candidates else None
+        default_index().remember(
+            artist_name, chosen["id"] if chosen else None, candidates, chosen["name"] if chosen else None
+        )
         return chosen["id"] if chosen else None
     except Exception as e:
         print(f"⚠️ Failed to search or choose artist for '{artist_name}': {e}")
         return None
 
 
-def get_top_tracks(artist_id, limit=5):
+def get_top_tracks(artist_id, limit=5, discography=None):
     try:
+        if discography is not None:
+            return discography.top_track_ids(limit)
         official_top = sp.artist_top_tracks(artist_id, country="US")["tracks"]
         return [track["id"] for track in official_top[:limit] if track.get("id")]
     except Exception as e:
@@ -300,52 +318,53 @@ def get_top_tracks(artist_id, limit=5):
         return []
 
 
-def get_recent_releases(artist_id, limit=5):
+def get_recent_releases(artist_id, limit=5, discography=None):
     try:
-        albums = sp.artist_albums(artist_id, album_type="single,album", limit=20)
+        discography = discography or ArtistDiscography.load(sp, artist_id)
         all_tracks = []
         seen_albums = set()
-        
-        for album in albums["items"]:
+        unique_albums = []
+
+        for album in discography.of_type("album", "single", limit=20):
             if album["name"] in seen_albums:
                 continue
             seen_albums.add(album["name"])
-            
-            try:
-                tracks = sp.album_tracks(album["id"])["items"]
-                all_tracks.extend(tracks)
-                if len(all_tracks) >= limit:
-                    break
-            except Exception as e:
-                print(f"⚠️ Failed to get tracks for album {album['name']}: {e}")
+            unique_albums.append(album)
+
+        tracklists = discography.tracklists(album["id"] for album in unique_albums)
+        for album in unique_albums:
+            if album["id"] not in tracklists:
+                print(f"⚠️ Failed to get tracks for album {album['name']}")
                 continue
-                
+            all_tracks.extend(tracklists[album["id"]])
+            if len(all_tracks) >= limit:
+                break
+
         return [track["id"] for track in all_tracks[:limit] if track.get("id")]
     except Exception as e:
         print(f"⚠️ Failed to get recent releases: {e}")
         return []
 
 
-def get_most_popular_album_tracks_relaxed(artist_id, min_tracks=1):
+def get_most_popular_album_tracks_relaxed(artist_id, min_tracks=1, discography=None):
     """
     Fallback function with relaxed filtering rules.
     """
     try:
-        albums = sp.artist_albums(artist_id, album_type="album,compilation", limit=20)
+        discography = discography or ArtistDiscography.load(sp, artist_id)
+        albums = discography.of_type("album", "compilation", limit=20)
         
-        if not albums["items"]:
+        if not albums:
             return [], None
         
-        # Just get tracks from the first available album
-        for album in albums["items"]:
-            try:
-                track_items = sp.album_tracks(album["id"])["items"]
-                if len(track_items) >= min_tracks:
-                    track_ids = [t["id"] for t in track_items if t.get("id")]
-                    print(f"🎧 Using album: {album['name']} (relaxed rules)")
-                    return track_ids, album["name"]
-            except Exception as e:
-                continue
+        # Load every candidate's tracklist in 20-album batches, then take the first that qualifies
+        tracklists = discography.tracklists(album["id"] for album in albums)
+        for album in albums:
+            track_items = tracklists.get(album["id"], [])
+            if len(track_items) >= min_tracks:
+                track_ids = [t["id"] for t in track_items if t.get("id")]
+                print(f"🎧 Using album: {album['name']} (relaxed rules)")
+                return track_ids, album["name"]
                 
         return [], None
     except Exception as e:
@@ -353,15 +372,17 @@ def get_most_popular_album_tracks_relaxed(artist_id, min_tracks=1):
         return [], None
 
 
-def get_most_popular_album_tracks(artist_id, min_tracks=2):
+def get_most_popular_album_tracks(artist_id, min_tracks=2, discography=None):
     try:
-        albums = sp.artist_albums(artist_id, album_type="album", limit=50)
+        discography = discography or ArtistDiscography.load(sp, artist_id)
+        albums = discography.of_type("album", limit=50)
         album_stats = []
         seen_album_names = set()
 
-        print(f"🗂️ Found {len(albums['items'])} albums for artist")
+        print(f"🗂️ Found {len(albums)} albums for artist")
 
-        for album in albums["items"]:
+        candidates = []
+        for album in albums:
             album_name = album["name"].strip().lower()
             if album_name in seen_album_names:
                 continue
@@ -372,42 +393,51 @@ def get_most_popular_album_tracks(artist_id, min_tracks=2):
                 print(f"🚫 Skipping remix/alternate album '{album['name']}'")
                 continue
 
-            try:
-                album_full = sp.album(album["id"])
-                track_items = sp.album_tracks(album["id"])["items"]
-            except Exception as e:
-                print(f"⚠️ Error loading album '{album['name']}': {e}")
+            candidates.append(album)
+
+        # Hydrate every candidate album in batches of 20 (shared with the
+        # other selectors); the full album objects carry their track lists.
+        try:
+            full_albums = discography.albums(album["id"] for album in candidates)
+            tracklists = discography.tracklists(full_albums)
+        except Exception as e:
+            print(f"⚠️ Error loading albums: {e}")
+            full_albums, tracklists = {}, {}
+
+        eligible = []
+        for album in candidates:
+            album_full = full_albums.get(album["id"])
+            if not album_full:
+                print(f"⚠️ Error loading album '{album['name']}'")
                 continue
 
+            track_items = tracklists[album["id"]]
             if len(track_items) < min_tracks:
                 print(f"🚫 Skipping album '{album['name']}' (only {len(track_items)} tracks)")
                 continue
 
-            track_ids = [t["id"] for t in track_items if t.get("id")]
-            
-            try:
-                track_pops = []
-                for tid in track_ids:
-                    try:
-                        track_data = sp.track(tid)
-                        if track_data and "popularity" in track_data:
-                            track_pops.append(track_data["popularity"])
-                    except Exception as e:
-                        print(f"⚠️ Could not get popularity for track ID {tid}: {e}")
-                
-                if not track_pops:
-                    continue
-                    
-                avg_popularity = sum(track_pops) / len(track_pops)
-            except Exception as e:
-                print(f"⚠️ Failed popularity calc for album '{album['name']}': {e}")
+            eligible.append((album_full, track_items))
+
+        # One sp.tracks call per 50 tracks across all eligible albums
+        try:
+            popularity = get_track_popularity(
+                sp, [t.get("id") for _, track_items in eligible for t in track_items]
+            )
+        except Exception as e:
+            print(f"⚠️ Could not get track popularity: {e}")
+            popularity = {}
+
+        for album_full, track_items in eligible:
+            track_pops = [popularity[t["id"]] for t in track_items if t.get("id") in popularity]
+            if not track_pops:
                 continue
 
+            avg_popularity = sum(track_pops) / len(track_pops)
             album_stats.append((avg_popularity, album_full, track_items))
 
         if not album_stats:
             print("❌ No eligible full-length albums found after filtering. Retrying with relaxed rules...")
-            return get_most_popular_album_tracks_relaxed(artist_id, min_tracks)
+            return get_most_popular_album_tracks_relaxed(artist_id, min_tracks, discography)
 
         best_album_stat = max(album_stats, key=lambda x: x[0])
         avg_pop, best_album, track_items = best_album_stat
@@ -427,34 +457,23 @@ def get_most_popular_album_tracks(artist_id, min_tracks=2):
     
     except Exception as e:
         print(f"⚠️ Failed to get most popular album tracks: {e}")
-        return get_most_popular_album_tracks_relaxed(artist_id, min_tracks)
+        return get_most_popular_album_tracks_relaxed(artist_id, min_tracks, discography)
 
 
 def get_or_create_playlist(user_id, playlist_name="Escuchar1"):
     try:
-        normalized_name = playlist_name.strip().lower()
-        playlists = []
-        limit = 50
-        offset = 0
-
-        # Fetch all user playlists
-        while True:
-            page = sp.current_user_playlists(limit=limit, offset=offset)
-            playlists.extend(page["items"])
-            if len(page["items"]) < limit:
-                break
-            offset += limit
-
-        # Check for existing playlist with exact name (case-insensitive)
-        for playlist in playlists:
-            if playlist and playlist.get("name", "").strip().lower() == normalized_name:
-                print(f"ℹ️ Found existing playlist: {playlist['name']}")
-                return playlist["id"], playlist["external_urls"]["spotify"]
+        # Check for existing playlist with exact name (case-insensitive) in the cached index
+        playlists = default_playlist_index()
+        playlist = playlists.find(sp, user_id, playlist_name)
+        if playlist:
+            print(f"ℹ️ Found existing playlist: {playlist['name']}")
+            return playlist["id"], playlist["url"]
 
         # If not found, create one
         new_playlist = sp.user_playlist_create(
             user=user_id, name=playlist_name, public=False
         )
+        playlists.add(user_id, new_playlist)
         print(f"🆕 Created new playlist: {playlist_name}")
         return new_playlist["id"], new_playlist["external_urls"]["spotify"]
     
@@ -494,57 +513,91 @@ def add_tracks_to_playlist(playlist_id, new_track_ids):
             print(f"✅ Added {len(valid_new_ids)} new tracks to playlist.")
         else:
             print("ℹ️ No new tracks to add — all are already in the playlist.")
+        return True
     
     except Exception as e:
         print(f"⚠️ Failed to add tracks to playlist: {e}")
+        return False
 
 
-def main(artist_csv, playlist_name="Escuchar"):
+def main(artist_csv, playlist_name="Escuchar", resume=False):
     try:
         artist_names = [name.strip() for name in artist_csv.split(",") if name.strip()]
         
         if not artist_names:
             print("❌ No artist names provided.")
             return
-        
-        user_id = sp.current_user()["id"]
-        playlist_id, playlist_url = get_or_create_playlist(
-            user_id, playlist_name=playlist_name
-        )
-
-        total_added = 0
-        for artist_name in artist_names:
-            print(f"\n🔍 Processing artist: {artist_name}")
-            artist_id = get_artist_id(artist_name)
-            if not artist_id:
-                print(f"❌ Artist '{artist_name}' not found.")
-                continue
 
-            top_tracks = get_top_tracks(artist_id, limit=7)
-            recent_tracks = get_recent_releases(artist_id, limit=5)
-            album_tracks, album_name = get_most_popular_album_tracks(artist_id)
-
-            # Combine all tracks and remove duplicates while preserving order
-            all_tracks = list(dict.fromkeys(top_tracks + recent_tracks + album_tracks))
-            
-            # Filter out any None values
-            all_tracks = [t for t in all_tracks if t]
-
-            if not all_tracks:
-                print(f"⚠️ No tracks found for {artist_name}")
-                continue
-
-            add_tracks_to_playlist(playlist_id, all_tracks)
-            total_added += len(all_tracks)
-
-            print(
-                f"🎧 Added up to {len(all_tracks)} tracks from '{artist_name}' to your '{playlist_name}' playlist."
-            )
-            if album_name:
-                print(f"   ↪ Most popular album: *{album_name}*")
-
-        print(f"\n✨ Finished! Added tracks from {len(artist_names)} artist(s)")
-        print(f"🔗 Final playlist link: {playlist_url}")
+        # Each finished step is journaled; resume=True skips what the last run finished
+        journal = RunJournal(journal_path("artists", playlist_name, artist_names), resume=resume)
+        if resume:
+            print(f"↩️ Resuming: {journal.summary()}")
+
+        with journal:
+            if journal.playlist:
+                playlist_id, playlist_url = journal.playlist["playlist_id"], journal.playlist["playlist_url"]
+            else:
+                user_id = sp.current_user()["id"]
+                playlist_id, playlist_url = get_or_create_playlist(
+                    user_id, playlist_name=playlist_name
+                )
+                journal.record_playlist(playlist_id, playlist_url)
+
+            total_added = 0
+            for artist_name in artist_names:
+                print(f"\n🔍 Processing artist: {artist_name}")
+                selected = journal.selected.get(artist_name)
+                if selected:
+                    all_tracks = journal.uncommitted(selected["track_ids"])
+                    album_name = selected.get("album_name")
+                    if not all_tracks:
+                        print(f"⏭️ Already added in the previous run.")
+                        continue
+                else:
+                    artist_id = journal.resolved.get(artist_name) or get_artist_id(artist_name)
+                    if not artist_id:
+                        print(f"❌ Artist '{artist_name}' not found.")
+                        continue
+                    if artist_name not in journal.resolved:
+                        journal.record_resolved(artist_name, artist_id)
+
+                    # One snapshot of top tracks, releases and tracklists feeds all three selectors
+                    try:
+                        discography = ArtistDiscography.load(sp, artist_id)
+                    except Exception as e:
+                        print(f"⚠️ Failed to load discography for {artist_name}: {e}")
+                        continue
+                    top_tracks = get_top_tracks(artist_id, limit=7, discography=discography)
+                    recent_tracks = get_recent_releases(artist_id, limit=5, discography=discography)
+                    album_tracks, album_name = get_most_popular_album_tracks(artist_id, discography=discography)
+
+                    # Combine all tracks and remove duplicates while preserving order
+                    all_tracks = list(dict.fromkeys(top_tracks + recent_tracks + album_tracks))
+
+                    # Filter out any None values
+                    all_tracks = [t for t in all_tracks if t]
+
+                    if not all_tracks:
+                        print(f"⚠️ No tracks found for {artist_name}")
+                        continue
+                    journal.record_selected(artist_name, all_tracks, album_name=album_name)
+
+                if add_tracks_to_playlist(playlist_id, all_tracks):
+                    journal.record_committed(all_tracks)
+                total_added += len(all_tracks)
+
+                print(
+                    f"🎧 Added up to {len(all_tracks)} tracks from '{artist_name}' to your '{playlist_name}' playlist."
+                )
+                if album_name:
+                    print(f"   ↪ Most popular album: *{album_name}*")
+
+            print(f"\n✨ Finished! Added tracks from {len(artist_names)} artist(s)")
+            print(f"🔗 Final playlist link: {playlist_url}")
+            print(f"🗄️ Spotify cache: {sp.cache.summary()}")
+            print(f"🚦 Spotify rate limiter: {sp.limiter.summary()}")
+            print(f"🎤 Artist index: {default_index().summary()}")
+            print(f"📓 Journal: {journal.summary()}")
         
     except Exception as e:
         print(f"❌ Critical error in main: {e}")
@@ -552,12 +605,14 @@ def main(artist_csv, playlist_name="Escuchar"):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 main.py 'Artist 1, Artist 2' [playlist_name]")
+    # --resume continues the last interrupted run for the same artists and playlist
+    args = [arg for arg in sys.argv[1:] if arg != "--resume"]
+    if len(args) < 1:
+        print("Usage: python3 main.py 'Artist 1, Artist 2' [playlist_name] [--resume]")
         print("Example: python3 main.py 'Daft Punk, The Weeknd' 'My Awesome Mix'")
         sys.exit(1)
 
-    artist_input = sys.argv[1]
-    playlist_name = sys.argv[2] if len(sys.argv) > 2 else "Escuchar"
+    artist_input = args[0]
+    playlist_name = args[1] if len(args) > 1 else "Escuchar"
     
-    main(artist_input, playlist_name)
\ No newline at end of file
+    main(artist_input, playlist_name, resume="--resume" in sys.argv[1:])
\ No newline at end of file
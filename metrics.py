@@ -0,0 +1,232 @@
+"""
+Per-call instrumentation for the external APIs (Spotify, OpenAI, Bright Data).
+
+Call sites wrap each network request in `timed(service, endpoint)`, which
+records a count per status, a latency histogram and the total time. Retries,
+429s, cache hits and LLM token usage are counted with `record` and
+`record_tokens`. Nothing is sent anywhere: at exit a summary table is printed
+(set METRICS_SUMMARY=0 to silence it) and, when METRICS_PROMETHEUS_FILE or
+METRICS_JSON_FILE is set, the same numbers are written there for the node
+exporter's textfile collector or for diffing runs.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+class _Call:
+    """Handle yielded by `timed`; set `status` to record an HTTP status code."""
+
+    def __init__(self):
+        self.status = None
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms keyed by (service, endpoint)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # (service, endpoint) -> {"statuses", "buckets", "seconds", "max"}
+        self._events = {}  # (service, endpoint, event) -> count
+        self._tokens = {}  # (model, kind) -> count
+
+    def observe(self, service: str, endpoint: str, seconds: float, status: str = "ok"):
+        with self._lock:
+            entry = self._calls.get((service, endpoint))
+            if entry is None:
+                entry = {"statuses": {}, "buckets": [0] * (len(LATENCY_BUCKETS) + 1), "seconds": 0.0, "max": 0.0}
+                self._calls[(service, endpoint)] = entry
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+            entry["buckets"][bucket] += 1
+            entry["seconds"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+
+    def record(self, service: str, endpoint: str, event: str, amount: int = 1):
+        with self._lock:
+            key = (service, endpoint, event)
+            self._events[key] = self._events.get(key, 0) + amount
+
+    def record_tokens(self, model: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        with self._lock:
+            for kind, amount in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                if amount:
+                    self._tokens[(model, kind)] = self._tokens.get((model, kind), 0) + amount
+
+    @contextmanager
+    def timed(self, service: str, endpoint: str):
+        """Time the block as one call; exceptions are recorded with their HTTP status or type."""
+        call = _Call()
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            if call.status is None:
+                http_status = getattr(e, "http_status", None) or getattr(e, "status_code", None)
+                call.status = http_status if http_status else f"error:{type(e).__name__}"
+            raise
+        finally:
+            self.observe(service, endpoint, time.perf_counter() - start, str(call.status or "ok"))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = [
+                {
+                    "service": service,
+                    "endpoint": endpoint,
+                    "count": sum(entry["statuses"].values()),
+                    "statuses": dict(entry["statuses"]),
+                    "buckets": list(entry["buckets"]),
+                    "seconds": entry["seconds"],
+                    "max_seconds": entry["max"],
+                }
+                for (service, endpoint), entry in sorted(self._calls.items())
+            ]
+            events = [
+                {"service": service, "endpoint": endpoint, "event": event, "count": count}
+                for (service, endpoint, event), count in sorted(self._events.items())
+            ]
+            tokens = [
+                {"model": model, "kind": kind, "count": count}
+                for (model, kind), count in sorted(self._tokens.items())
+            ]
+        return {"buckets": list(LATENCY_BUCKETS), "calls": calls, "events": events, "tokens": tokens}
+
+    def summary(self) -> str:
+        snapshot = self.snapshot()
+        events = {(e["service"], e["endpoint"], e["event"]): e["count"] for e in snapshot["events"]}
+        lines = [f"   {'service':<11} {'endpoint':<22} {'calls':>6} {'errors':>6} {'retries':>7} {'429s':>5} {'avg ms':>8} {'p95 ms':>8} {'total s':>8}"]
+        for call in snapshot["calls"]:
+            key = (call["service"], call["endpoint"])
+            errors = sum(count for status, count in call["statuses"].items() if not _succeeded(status))
+            lines.append(
+                f"   {call['service']:<11} {call['endpoint'][:22]:<22} {call['count']:>6} {errors:>6} "
+                f"{events.get(key + ('retry',), 0):>7} {events.get(key + ('throttled',), 0):>5} "
+                f"{call['seconds'] / call['count'] * 1000:>8.0f} {_percentile_ms(call, 0.95):>8} {call['seconds']:>8.1f}"
+            )
+        cache_hits = [e for e in snapshot["events"] if e["event"] == "cache_hit"]
+        if cache_hits:
+            lines.append("   Cache hits: " + ", ".join(f"{e['service']} {e['endpoint']} {e['count']}" for e in cache_hits))
+        if snapshot["tokens"]:
+            lines.append("   LLM tokens: " + ", ".join(f"{t['model']} {t['kind']} {t['count']}" for t in snapshot["tokens"]))
+        return "\n".join(lines)
+
+    def write_json(self, path: str):
+        _write_atomic(path, json.dumps(self.snapshot(), indent=1))
+
+    def write_prometheus(self, path: str):
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP music_api_requests_total External API calls by status.",
+            "# TYPE music_api_requests_total counter",
+        ]
+        for call in snapshot["calls"]:
+            for status, count in sorted(call["statuses"].items()):
+                lines.append(f"music_api_requests_total{_labels(call, status=status)} {count}")
+        lines += [
+            "# HELP music_api_request_duration_seconds External API call latency.",
+            "# TYPE music_api_request_duration_seconds histogram",
+        ]
+        for call in snapshot["calls"]:
+            cumulative = 0
+            for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], call["buckets"]):
+                cumulative += count
+                lines.append(f"music_api_request_duration_seconds_bucket{_labels(call, le=bound)} {cumulative}")
+            lines.append(f"music_api_request_duration_seconds_sum{_labels(call)} {call['seconds']:.6f}")
+            lines.append(f"music_api_request_duration_seconds_count{_labels(call)} {call['count']}")
+        lines += [
+            "# HELP music_api_events_total Retries, 429s and cache hits.",
+            "# TYPE music_api_events_total counter",
+        ]
+        for event in snapshot["events"]:
+            lines.append(f"music_api_events_total{_labels(event, event=event['event'])} {event['count']}")
+        lines += [
+            "# HELP music_llm_tokens_total LLM tokens billed.",
+            "# TYPE music_llm_tokens_total counter",
+        ]
+        for tokens in snapshot["tokens"]:
+            lines.append(f'music_llm_tokens_total{{model="{tokens["model"]}",kind="{tokens["kind"]}"}} {tokens["count"]}')
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+    def report(self):
+        """Print the summary and write the files named by METRICS_PROMETHEUS_FILE / METRICS_JSON_FILE."""
+        if not self._calls and not self._tokens:
+            return
+        if os.getenv("METRICS_SUMMARY", "1") != "0":
+            print("\n📊 API calls:")
+            print(self.summary())
+        if os.getenv("METRICS_PROMETHEUS_FILE"):
+            self.write_prometheus(os.getenv("METRICS_PROMETHEUS_FILE"))
+        if os.getenv("METRICS_JSON_FILE"):
+            self.write_json(os.getenv("METRICS_JSON_FILE"))
+
+
+def _succeeded(status):
+    return status == "ok" or status[:1] in ("2", "3")
+
+
+def _percentile_ms(call, fraction):
+    """Upper bound of the histogram bucket holding the given percentile."""
+    target = call["count"] * fraction
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS, call["buckets"]):
+        seen += count
+        if seen >= target:
+            return f"≤{bound * 1000:.0f}"
+    return f">{LATENCY_BUCKETS[-1] * 1000:.0f}"
+
+
+def _labels(entry, **extra):
+    labels = {"service": entry["service"], "endpoint": entry["endpoint"], **extra}
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def _write_atomic(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def default_metrics() -> Metrics:
+    """Process-wide registry; its report runs at interpreter exit."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+            atexit.register(_metrics.report)
+        return _metrics
+
+
+def timed(service: str, endpoint: str):
+    return default_metrics().timed(service, endpoint)
+
+
+def record(service: str, endpoint: str, event: str, amount: int = 1):
+    default_metrics().record(service, endpoint, event, amount)
+
+
+def record_tokens(model: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+    default_metrics().record_tokens(model, prompt_tokens, completion_tokens)
+
+
+def record_http_retries(service: str, endpoint: str, response):
+    """Count the retries urllib3 made inside a requests call, and how many were 429s."""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    history = getattr(retries, "history", None) or ()
+    if history:
+        record(service, endpoint, "retry", len(history))
+        throttled = sum(1 for attempt in history if attempt.status == 429)
+        if throttled:
+            record(service, endpoint, "throttled", throttled)
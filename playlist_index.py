@@ -0,0 +1,167 @@
+"""
+Cached playlist-name -> playlist index for `get_or_create_playlist`.
+
+Listing a user's playlists is 50 per call. The index is built by fetching
+page 1 (which carries the total) and then every remaining offset at once on
+a small thread pool, so thousands of playlists take about as long as two
+calls. It is kept in the Spotify `DiskCache` per user.
+
+Within PLAYLIST_INDEX_TRUST seconds of the last check, lookups are answered
+from memory with no API call. After that, a lookup re-reads page 1 only:
+Spotify lists newest playlists first, so if the total is unchanged and page 1
+holds no unknown playlist, the index still covers everything; entries whose
+snapshot_id changed (renamed or edited) are updated in place. A changed
+total or an unknown playlist on page 1 triggers a full rebuild. Playlists
+created through `add` go straight into the index.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from disk_cache import DiskCache
+from spotify_cache import default_cache
+
+PAGE_SIZE = 50
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TRUST_SECONDS = 300
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_playlist_name(name: str) -> str:
+    return (name or "").strip().lower()
+
+
+def _entry(playlist: dict) -> Dict:
+    return {
+        "id": playlist["id"],
+        "name": playlist.get("name", ""),
+        "url": (playlist.get("external_urls") or {}).get("spotify"),
+        "snapshot_id": playlist.get("snapshot_id"),
+    }
+
+
+class PlaylistIndex:
+    """Per-user playlist listing, built with parallel pagination and refreshed from page 1."""
+
+    def __init__(self, cache: DiskCache, max_workers: int = DEFAULT_MAX_WORKERS,
+                 trust_seconds: float = DEFAULT_TRUST_SECONDS):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.trust_seconds = trust_seconds
+        self._lock = threading.Lock()
+        self._users = {}  # user_id -> {"total", "playlists", "checked_at"}
+        self._stats = {"memory": 0, "page_checks": 0, "rebuilds": 0, "pages_fetched": 0}
+
+    def find(self, sp, user_id: str, playlist_name: str) -> Optional[Dict]:
+        """First playlist (in Spotify's listing order) with this name, case-insensitively."""
+        wanted = normalize_playlist_name(playlist_name)
+        with self._lock:
+            index = self._current(sp, user_id)
+            for entry in index["playlists"]:
+                if normalize_playlist_name(entry["name"]) == wanted:
+                    return dict(entry)
+        return None
+
+    def add(self, user_id: str, playlist: dict):
+        """Record a playlist this process just created, at the top as Spotify lists it."""
+        with self._lock:
+            index = self._users.get(user_id) or self.cache.get(self._key(user_id))
+            if index is None:
+                return
+            index["playlists"].insert(0, _entry(playlist))
+            index["total"] += 1
+            self._save(user_id, index)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._users.pop(user_id, None)
+            self.cache.delete(self._key(user_id))
+
+    def _current(self, sp, user_id):
+        now = time.time()
+        index = self._users.get(user_id) or self.cache.get(self._key(user_id))
+        if index is not None and now - index["checked_at"] < self.trust_seconds:
+            self._users[user_id] = index
+            self._stats["memory"] += 1
+            return index
+
+        first = sp.current_user_playlists(limit=PAGE_SIZE, offset=0)
+        self._stats["pages_fetched"] += 1
+        if index is not None and self._refresh_from_first_page(index, first):
+            self._stats["page_checks"] += 1
+        else:
+            index = self._build(sp, first)
+            self._stats["rebuilds"] += 1
+        index["checked_at"] = now
+        self._save(user_id, index)
+        return index
+
+    def _refresh_from_first_page(self, index, first) -> bool:
+        """Apply page 1 to the index in place; False if it needs a full rebuild."""
+        if first.get("total") != index["total"]:
+            return False
+        by_id = {entry["id"]: entry for entry in index["playlists"]}
+        for playlist in first.get("items") or []:
+            if not playlist:
+                continue
+            known = by_id.get(playlist["id"])
+            if known is None:
+                return False
+            if known["snapshot_id"] != playlist.get("snapshot_id"):
+                known.update(_entry(playlist))
+        return True
+
+    def _build(self, sp, first) -> Dict:
+        total = first.get("total") or 0
+        offsets = list(range(PAGE_SIZE, total, PAGE_SIZE))
+        pages = [first]
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(offsets))) as executor:
+                pages += executor.map(
+                    lambda offset: sp.current_user_playlists(limit=PAGE_SIZE, offset=offset), offsets
+                )
+            self._stats["pages_fetched"] += len(offsets)
+
+        playlists: List[Dict] = []
+        seen = set()
+        for page in pages:
+            for playlist in page.get("items") or []:
+                # Offsets can shift mid-build if a playlist is added; skip the repeat
+                if playlist and playlist["id"] not in seen:
+                    seen.add(playlist["id"])
+                    playlists.append(_entry(playlist))
+        return {"total": total, "playlists": playlists}
+
+    def _save(self, user_id, index):
+        self._users[user_id] = index
+        self.cache.set(self._key(user_id), index)
+
+    @staticmethod
+    def _key(user_id):
+        return "playlist_index:" + user_id
+
+    def summary(self) -> str:
+        with self._lock:
+            stats = dict(self._stats)
+        return (
+            f"{stats['memory']} from memory, {stats['page_checks']} page-1 checks, "
+            f"{stats['rebuilds']} rebuilds, {stats['pages_fetched']} pages fetched"
+        )
+
+
+def default_playlist_index() -> PlaylistIndex:
+    """Process-wide index stored in the Spotify cache (PLAYLIST_INDEX_WORKERS, PLAYLIST_INDEX_TRUST)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PlaylistIndex(
+                default_cache(),
+                max_workers=int(os.getenv("PLAYLIST_INDEX_WORKERS", DEFAULT_MAX_WORKERS)),
+                trust_seconds=float(os.getenv("PLAYLIST_INDEX_TRUST", DEFAULT_TRUST_SECONDS)),
+            )
+        return _index
@@ -0,0 +1,122 @@
+"""
+Single-writer commit queue for playlist additions.
+
+Workers hand their resolved track IDs to `PlaylistWriter.submit`, which
+checks them against the playlist's membership set (loaded once, fully
+paginated) and queues only the new ones. One background thread drains the
+queue and writes full 100-track batches, so concurrent workers never race
+each other into duplicates and a lineup costs about N-tracks/100 writes.
+`on_commit` is called with each batch once Spotify has accepted it; a
+batch Spotify rejects is dropped from the membership set so it can be
+submitted again.
+"""
+
+import queue
+import threading
+from typing import Callable, Iterable, List, Optional, Set
+
+from spotify_batch import PLAYLIST_ITEMS_PER_CALL, chunked
+
+_STOP = object()
+
+
+def load_playlist_track_ids(sp, playlist_id) -> Set[str]:
+    """Return the IDs of every track in the playlist, paging 100 at a time."""
+    existing_ids = set()
+    limit = 100
+    offset = 0
+
+    while True:
+        response = sp.playlist_tracks(
+            playlist_id, fields="items.track.id,total", limit=limit, offset=offset
+        )
+        items = response.get("items", [])
+        for item in items:
+            if item and item.get("track") and item["track"].get("id"):
+                existing_ids.add(item["track"]["id"])
+        offset += limit
+        if len(items) < limit:
+            break
+
+    return existing_ids
+
+
+class PlaylistWriter:
+    """Owns every write to one playlist for the duration of a run."""
+
+    def __init__(self, sp, playlist_id, batch_size: int = PLAYLIST_ITEMS_PER_CALL,
+                 on_commit: Optional[Callable[[List[str]], None]] = None):
+        self.sp = sp
+        self.playlist_id = playlist_id
+        self.batch_size = batch_size
+        self.on_commit = on_commit
+        self.written = 0
+        self.writes = 0
+        self.failed: List[str] = []
+        self._membership: Set[str] = set()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._membership = load_playlist_track_ids(self.sp, self.playlist_id)
+        self._thread = threading.Thread(target=self._run, name="playlist-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, track_ids: Iterable[str]) -> int:
+        """Queue the tracks that aren't in the playlist yet; returns how many were new."""
+        with self._lock:
+            new_ids = []
+            for track_id in track_ids:
+                if track_id and track_id not in self._membership:
+                    self._membership.add(track_id)
+                    new_ids.append(track_id)
+        if new_ids:
+            self._queue.put(new_ids)
+        return len(new_ids)
+
+    def close(self):
+        """Flush whatever is still pending and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        pending = []
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            pending.extend(item)
+            while len(pending) >= self.batch_size:
+                self._flush(pending[:self.batch_size])
+                pending = pending[self.batch_size:]
+        for batch in chunked(pending, self.batch_size):
+            self._flush(batch)
+
+    def _flush(self, batch):
+        try:
+            self.sp.playlist_add_items(self.playlist_id, batch)
+            self.written += len(batch)
+            self.writes += 1
+        except Exception as e:
+            print(f"   ⚠️ Failed to add {len(batch)} tracks to playlist: {e}")
+            self.failed.extend(batch)
+            # Not in the playlist after all, so a later submit may queue them again
+            with self._lock:
+                self._membership.difference_update(batch)
+            return
+        if self.on_commit:
+            # The writer thread must outlive a failing callback, or every later batch sits in the queue
+            try:
+                self.on_commit(batch)
+            except Exception as e:
+                print(f"   ⚠️ Commit callback failed for {len(batch)} tracks: {e}")
@@ -0,0 +1,135 @@
+"""
+Process-wide rate limiting for Spotify calls.
+
+`RateLimiter` is a token bucket shared by every thread and coroutine in the
+process. When any caller receives a 429, `pause()` pushes the whole bucket
+back by the server's Retry-After, so all callers wait together instead of
+retrying on their own schedules. `RateLimitedSpotify` wraps a spotipy client
+so every call takes a token and 429s are retried through the shared pause.
+"""
+
+import functools
+import os
+import threading
+import time
+from typing import Dict
+
+import metrics
+
+DEFAULT_RATE = 10.0  # requests per second
+DEFAULT_BURST = 20
+DEFAULT_RETRY_AFTER = 1.0
+MAX_THROTTLE_RETRIES = 5
+
+
+class RateLimiter:
+    """Token bucket with a shared Retry-After pause."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()  # time `_tokens` refers to; may be in the future while paused
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            wait = (self._updated - now) + max(0.0, -self._tokens / self.rate)
+            self._stats["requests"] += 1
+            self._stats["waited_seconds"] += wait
+            return wait
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        # Only async callers need asyncio; keep it off the sync startup path
+        import asyncio
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds`, for every caller."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._updated:
+                self._updated = resume_at
+                self._tokens = min(self._tokens, 0.0)
+            self._stats["throttled"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats)
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (
+            f"{stats['requests']} requests, {stats['throttled']} throttled (429), "
+            f"{stats['waited_seconds']:.1f}s spent waiting"
+        )
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def default_limiter() -> RateLimiter:
+    """The process-wide Spotify limiter (SPOTIFY_RATE_LIMIT req/s, SPOTIFY_RATE_BURST burst)."""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(
+                rate=float(os.getenv("SPOTIFY_RATE_LIMIT", DEFAULT_RATE)),
+                burst=int(os.getenv("SPOTIFY_RATE_BURST", DEFAULT_BURST)),
+            )
+    return _default_limiter
+
+
+def retry_after_seconds(headers) -> float:
+    """Parse a Retry-After header value, falling back to one second."""
+    try:
+        return max(0.0, float((headers or {}).get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class RateLimitedSpotify:
+    """Proxy that runs every spotipy call through a shared `RateLimiter`."""
+
+    def __init__(self, client, limiter: RateLimiter = None):
+        self._client = client
+        self.limiter = limiter if limiter is not None else default_limiter()
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def limited_call(*args, **kwargs):
+            for attempt in range(MAX_THROTTLE_RETRIES + 1):
+                self.limiter.acquire()
+                try:
+                    with metrics.timed("spotify", name):
+                        return attr(*args, **kwargs)
+                except Exception as e:
+                    if getattr(e, "http_status", None) != 429:
+                        raise
+                    metrics.record("spotify", name, "throttled")
+                    if attempt == MAX_THROTTLE_RETRIES:
+                        raise
+                    metrics.record("spotify", name, "retry")
+                    self.limiter.pause(retry_after_seconds(getattr(e, "headers", None)))
+
+        return limited_call
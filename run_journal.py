@@ -0,0 +1,129 @@
+"""
+Write-ahead progress journal for long playlist runs.
+
+`festival_playlist.main` and `main.main` append one JSON line per finished
+step: the artists extracted from a lineup, the playlist picked, each artist
+resolved, each artist's tracks selected, and each batch of tracks committed
+to the playlist. A run started
+with `--resume` replays the journal first, skips every step already in it
+and only resubmits selected tracks that were never committed, so a crash
+near the end of a 500-artist lineup costs a handful of API calls.
+
+Lookups that failed (artist not found, no tracks) are not journaled and are
+retried on resume. Every record is flushed as it is written; commit records
+are also fsynced, since those are what resume trusts not to redo. A torn
+last line from a crash is ignored.
+
+Journals live in RUN_JOURNAL_DIR (default .run_journal/), one file per
+playlist and run input (the artist list, or the raw lineup text for
+festival runs), so a different lineup never picks up another run's
+progress. Festival runs journal the artists the LLM extracted and reuse
+them on resume, since a fresh extraction may not match.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+DEFAULT_JOURNAL_DIR = ".run_journal"
+
+
+def journal_path(kind: str, playlist_name: str, run_input: Union[str, Iterable[str]],
+                 directory: Optional[str] = None) -> str:
+    """Journal file for one run, keyed by playlist name and its input (lineup text or artist list)."""
+    directory = directory or os.getenv("RUN_JOURNAL_DIR", DEFAULT_JOURNAL_DIR)
+    key = run_input if isinstance(run_input, str) else list(run_input)
+    digest = hashlib.sha256(json.dumps([playlist_name, key]).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"{kind}-{digest}.jsonl")
+
+
+class RunJournal:
+    """Append-only record of completed steps, loaded back on resume."""
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.artists: Optional[List[str]] = None
+        self.playlist: Optional[Dict] = None
+        self.resolved: Dict[str, str] = {}  # artist name -> artist ID
+        self.selected: Dict[str, Dict] = {}  # artist name -> {"track_ids", ...}
+        self.committed: Set[str] = set()
+        self.replayed_steps = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+        # A fresh run truncates; a resumed one keeps appending
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn write from a crash
+                self._apply(record)
+                self.replayed_steps += 1
+
+    def _apply(self, record: Dict):
+        step = record.get("step")
+        if step == "artists":
+            self.artists = record["artists"]
+        elif step == "playlist":
+            self.playlist = record
+        elif step == "resolved":
+            self.resolved[record["artist"]] = record["artist_id"]
+        elif step == "selected":
+            self.selected[record["artist"]] = record
+        elif step == "committed":
+            self.committed.update(record["track_ids"])
+
+    def _append(self, record: Dict, sync: bool = False):
+        with self._lock:
+            self._apply(record)
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+
+    def record_artists(self, artists: List[str]):
+        self._append({"step": "artists", "artists": list(artists)})
+
+    def record_playlist(self, playlist_id: str, playlist_url: str):
+        self._append({"step": "playlist", "playlist_id": playlist_id, "playlist_url": playlist_url})
+
+    def record_resolved(self, artist_name: str, artist_id: str):
+        self._append({"step": "resolved", "artist": artist_name, "artist_id": artist_id})
+
+    def record_selected(self, artist_name: str, track_ids: List[str], **extra):
+        self._append({"step": "selected", "artist": artist_name, "track_ids": list(track_ids), **extra})
+
+    def record_committed(self, track_ids: List[str]):
+        self._append({"step": "committed", "track_ids": list(track_ids)}, sync=True)
+
+    def uncommitted(self, track_ids: Iterable[str]) -> List[str]:
+        """The given tracks minus those already committed by this run."""
+        with self._lock:
+            return [track_id for track_id in track_ids if track_id not in self.committed]
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.resolved)} resolved, {len(self.selected)} selected, "
+            f"{len(self.committed)} tracks committed ({self.path})"
+        )
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,165 @@
+"""
+Non-blocking Spotify catalogue client for the asyncio pipelines.
+
+`AsyncSpotify` mirrors the handful of spotipy read calls the selectors use,
+over a single aiohttp session. It borrows the access token from the regular
+(sync) client and, when that client is a `CachedSpotify`, reads and writes
+the same cache entries, so sync and async runs warm each other up. Every
+request goes through one semaphore, which is the pipeline's global
+concurrency limit, and through the sync client's `RateLimiter`, so a 429
+seen here pauses the threaded callers too.
+"""
+
+import asyncio
+from typing import Dict, Iterable, List
+
+import metrics
+from spotify_batch import ALBUM_TRACKS_PER_CALL, ALBUMS_PER_CALL, chunked, remaining_offsets, unique_ids
+from rate_limiter import retry_after_seconds
+from spotify_cache import ENDPOINT_TTLS
+
+API_BASE = "https://api.spotify.com/v1/"
+DEFAULT_MAX_CONCURRENCY = 16
+MAX_RETRIES = 3
+
+
+class AsyncSpotify:
+    """aiohttp-backed subset of the spotipy API, sharing auth and cache with `sp`."""
+
+    def __init__(self, sp, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self._sp = sp
+        self.cache = getattr(sp, "cache", None)
+        self.limiter = getattr(sp, "limiter", None)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+        self._access_token = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    async def artist_top_tracks(self, artist_id, country="US"):
+        return await self._call(
+            "artist_top_tracks", f"artists/{artist_id}/top-tracks", {"country": country},
+            artist_id, country=country,
+        )
+
+    async def artist_albums(self, artist_id, album_type=None, country=None, limit=20, offset=0):
+        params = {"album_type": album_type, "country": country, "limit": limit, "offset": offset}
+        return await self._call(
+            "artist_albums", f"artists/{artist_id}/albums", params,
+            artist_id, album_type=album_type, country=country, limit=limit, offset=offset,
+        )
+
+    async def albums(self, albums):
+        return await self._call("albums", "albums/", {"ids": ",".join(albums)}, albums)
+
+    async def album_tracks(self, album_id, limit=50, offset=0, market=None):
+        params = {"limit": limit, "offset": offset, "market": market}
+        return await self._call(
+            "album_tracks", f"albums/{album_id}/tracks", params,
+            album_id, limit=limit, offset=offset, market=market,
+        )
+
+    async def search(self, q, limit=10, offset=0, type="track", market=None):
+        params = {"q": q, "limit": limit, "offset": offset, "type": type, "market": market}
+        return await self._call(
+            "search", "search", params,
+            q, limit=limit, offset=offset, type=type, market=market,
+        )
+
+    async def next(self, result):
+        if result.get("next"):
+            return await self._get(result["next"], endpoint="next")
+        return None
+
+    async def _call(self, endpoint, path, params, *args, **kwargs):
+        key = None
+        if self.cache is not None and hasattr(self._sp, "cache_key_for"):
+            key = self._sp.cache_key_for(endpoint, args, kwargs)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = await self._get(API_BASE + path, params, endpoint)
+
+        if key is not None and result is not None:
+            self.cache.set(key, result, ttl=ENDPOINT_TTLS.get(endpoint))
+        return result
+
+    async def _get(self, url, params=None, endpoint="get"):
+        query = {k: str(v) for k, v in (params or {}).items() if v is not None}
+        status = None
+        for attempt in range(MAX_RETRIES + 1):
+            delay = 0
+            if self.limiter is not None:
+                await self.limiter.acquire_async()
+            async with self._semaphore:
+                headers = {"Authorization": f"Bearer {await self._token()}"}
+                with metrics.timed("spotify", endpoint) as call:
+                    async with self._session.get(url, params=query, headers=headers) as response:
+                        call.status = status = response.status
+                        if status == 429:
+                            metrics.record("spotify", endpoint, "throttled")
+                            delay = retry_after_seconds(response.headers)
+                            if self.limiter is not None:
+                                # Everyone waits; our next acquire picks up the pause
+                                self.limiter.pause(delay)
+                                delay = 0
+                        elif status == 401:
+                            self._access_token = None
+                        elif status >= 500:
+                            delay = 0.5 * (attempt + 1)
+                        else:
+                            response.raise_for_status()
+                            return await response.json()
+            if attempt < MAX_RETRIES:
+                metrics.record("spotify", endpoint, "retry")
+                await asyncio.sleep(delay)
+        raise RuntimeError(f"Spotify request failed with HTTP {status} after {MAX_RETRIES + 1} attempts: {url}")
+
+    async def _token(self):
+        if self._access_token is None:
+            # The auth manager may refresh the token over the network
+            self._access_token = await asyncio.to_thread(
+                self._sp.auth_manager.get_access_token, as_dict=False
+            )
+        return self._access_token
+
+
+async def get_albums_async(asp: AsyncSpotify, album_ids: Iterable[str]) -> Dict[str, dict]:
+    """Async `spotify_batch.get_albums`: all 20-album batches fetched concurrently."""
+    batches = list(chunked(unique_ids(album_ids), ALBUMS_PER_CALL))
+    responses = await asyncio.gather(*(asp.albums(batch) for batch in batches))
+    albums = {}
+    for batch, response in zip(batches, responses):
+        for album_id, album in zip(batch, response.get("albums") or []):
+            if album:
+                albums[album_id] = album
+    return albums
+
+
+async def album_track_items_async(asp: AsyncSpotify, album: dict) -> List[dict]:
+    """Async `spotify_batch.album_track_items`; the extra pages are fetched concurrently."""
+    page = album.get("tracks") or {}
+    items = list(page.get("items") or [])
+    if page.get("next") and page.get("total"):
+        pages = await asyncio.gather(*(
+            asp.album_tracks(album["id"], limit=ALBUM_TRACKS_PER_CALL, offset=offset)
+            for offset in remaining_offsets(len(items), page["total"])
+        ))
+        for extra in pages:
+            items.extend(extra.get("items") or [])
+        return items
+    while page.get("next"):
+        page = await asp.next(page)
+        if not page:
+            break
+        items.extend(page.get("items") or [])
+    return items
+
@@ -0,0 +1,87 @@
+"""
+Batched Spotify hydration helpers.
+
+Spotify's multi-object endpoints take up to 50 track IDs (`sp.tracks`) and
+20 album IDs (`sp.albums`) per request, and full album objects already embed
+their first page of 50 tracks. These helpers group IDs into those batches so
+callers pay a few round trips instead of one per album or track: scanning
+albums costs one call per 20, plus one per extra 50 tracks on long albums.
+"""
+
+from typing import Dict, Iterable, Iterator, List
+
+TRACKS_PER_CALL = 50
+ALBUMS_PER_CALL = 20
+ALBUM_TRACKS_PER_CALL = 50
+PLAYLIST_ITEMS_PER_CALL = 100
+
+
+def chunked(items: List, size: int) -> Iterator[List]:
+    """Yield successive `size`-sized slices of `items`."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def unique_ids(ids: Iterable[str]) -> List[str]:
+    """Drop empty IDs and duplicates while preserving order."""
+    return list(dict.fromkeys(i for i in ids if i))
+
+
+def get_albums(sp, album_ids: Iterable[str]) -> Dict[str, dict]:
+    """Fetch full album objects, 20 per call. Returns {album_id: album}."""
+    albums = {}
+    for batch in chunked(unique_ids(album_ids), ALBUMS_PER_CALL):
+        response = sp.albums(batch)
+        for album_id, album in zip(batch, response.get("albums") or []):
+            if album:
+                albums[album_id] = album
+    return albums
+
+
+def get_tracks(sp, track_ids: Iterable[str]) -> Dict[str, dict]:
+    """Fetch full track objects, 50 per call. Returns {track_id: track}."""
+    tracks = {}
+    for batch in chunked(unique_ids(track_ids), TRACKS_PER_CALL):
+        response = sp.tracks(batch)
+        for track_id, track in zip(batch, response.get("tracks") or []):
+            if track:
+                tracks[track_id] = track
+    return tracks
+
+
+def get_track_popularity(sp, track_ids: Iterable[str]) -> Dict[str, int]:
+    """Return {track_id: popularity} for every track Spotify knows about."""
+    return {
+        track_id: track["popularity"]
+        for track_id, track in get_tracks(sp, track_ids).items()
+        if "popularity" in track
+    }
+
+
+def album_track_items(sp, album: dict) -> List[dict]:
+    """
+    Return the simplified track objects of a full album object.
+
+    Reuses the tracks embedded in the album and only pages for the rest when
+    the album is longer than the embedded page. Pages are fetched by offset
+    through `album_tracks`, which the response cache keeps; `next` is only
+    followed when the page doesn't say how many tracks there are.
+    """
+    page = album.get("tracks") or {}
+    items = list(page.get("items") or [])
+    if page.get("next") and page.get("total"):
+        for offset in remaining_offsets(len(items), page["total"]):
+            items.extend(sp.album_tracks(album["id"], limit=ALBUM_TRACKS_PER_CALL, offset=offset).get("items") or [])
+        return items
+    while page.get("next"):
+        page = sp.next(page)
+        if not page:
+            break
+        items.extend(page.get("items") or [])
+    return items
+
+
+def remaining_offsets(loaded: int, total: int) -> range:
+    """Offsets of the `album_tracks` pages still needed after the embedded page."""
+    return range(loaded, total, ALBUM_TRACKS_PER_CALL)
+
@@ -0,0 +1,97 @@
+"""
+Shared response cache around the spotipy client.
+
+`CachedSpotify` wraps a `spotipy.Spotify` instance and answers read-only
+catalogue calls (`search`, `artist_top_tracks`, `artist_albums`,
+`album_tracks`, ...) from a `DiskCache`, so re-running a lineup makes close
+to zero network calls. Anything not listed in `ENDPOINT_TTLS` (playlist
+writes, `current_user`, ...) goes straight to the wrapped client.
+"""
+
+import inspect
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from disk_cache import DiskCache
+
+DEFAULT_CACHE_PATH = ".spotify_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 50000
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Seconds each endpoint's responses stay fresh. Album tracklists practically
+# never change; top tracks and popularity drift daily.
+ENDPOINT_TTLS = {
+    "search": 7 * DAY,
+    "artist": 7 * DAY,
+    "artist_albums": DAY,
+    "artist_top_tracks": 6 * HOUR,
+    "album": 30 * DAY,
+    "albums": 30 * DAY,
+    "album_tracks": 30 * DAY,
+    "track": DAY,
+    "tracks": DAY,
+}
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache() -> DiskCache:
+    """Process-wide Spotify cache shared by every wrapped client."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = DiskCache(
+                os.getenv("SPOTIFY_CACHE_PATH", DEFAULT_CACHE_PATH),
+                max_entries=int(os.getenv("SPOTIFY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+        return _default_cache
+
+
+def cache_key(endpoint: str, args: tuple, kwargs: dict) -> str:
+    return "spotify:" + json.dumps([endpoint, list(args), kwargs], sort_keys=True)
+
+
+class CachedSpotify:
+    """Proxy that serves cacheable spotipy calls from a DiskCache."""
+
+    def __init__(self, client, cache: Optional[DiskCache] = None, ttls: Optional[Dict[str, float]] = None):
+        self._client = client
+        self.cache = cache if cache is not None else default_cache()
+        self.ttls = ttls if ttls is not None else ENDPOINT_TTLS
+
+    def cache_key_for(self, name: str, args: tuple, kwargs: dict) -> str:
+        """
+        Key for `name(*args, **kwargs)` with arguments bound to the wrapped
+        method's signature, so positional and keyword spellings of the same
+        call (and other clients mirroring it) share one entry.
+        """
+        try:
+            bound = inspect.signature(getattr(self._client, name)).bind(*args, **kwargs)
+        except (TypeError, ValueError):
+            return cache_key(name, args, kwargs)
+        bound.apply_defaults()
+        return cache_key(name, (), dict(bound.arguments))
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in self.ttls or not callable(attr):
+            return attr
+
+        ttl = self.ttls[name]
+
+        def cached_call(*args, **kwargs):
+            key = self.cache_key_for(name, args, kwargs)
+            result = self.cache.get(key)
+            if result is not None:
+                return result
+            result = attr(*args, **kwargs)
+            if result is not None:
+                self.cache.set(key, result, ttl=ttl)
+            return result
+
+        return cached_call
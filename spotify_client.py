@@ -0,0 +1,53 @@
+"""
+Factory for the Spotify client used by every entry point.
+
+Each module still owns its auth settings; this only decides how the raw
+`spotipy.Spotify` is wrapped so they all share the same cache and the same
+process-wide rate limiter. spotipy and requests are imported on first use.
+"""
+
+from typing import Any, Callable
+
+from lazy_client import LazyClient
+from rate_limiter import RateLimitedSpotify
+from spotify_cache import CachedSpotify
+
+
+def spotify_session():
+    """
+    requests session for spotipy that retries 5xx but leaves 429 alone.
+
+    spotipy's default session lets urllib3 sleep out Retry-After on whichever
+    thread got the 429; returning the response instead lets the shared
+    limiter pause every caller at once.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=3,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        backoff_factor=0.3,
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def build_spotify(auth_manager):
+    """Return a cached, rate-limited `spotipy.Spotify` for the given auth manager."""
+    import spotipy
+
+    raw = spotipy.Spotify(auth_manager=auth_manager, requests_session=spotify_session())
+    return CachedSpotify(RateLimitedSpotify(raw))
+
+
+def lazy_spotify(make_auth_manager: Callable[[], Any]) -> LazyClient:
+    """`build_spotify` deferred until the client is first used; the auth manager is built then too."""
+    return LazyClient(lambda: build_spotify(make_auth_manager()))
@@ -0,0 +1,164 @@
+"""
+Celery tasks for spreading lineups and tracklist batches across workers.
+
+The work is split where the pipeline already splits it:
+
+    resolve_artist         artist name -> Spotify artist ID (artist index, else search + most popular)
+    select_artist_tracks   artist ID -> representative track IDs (albums, top tracks)
+    tracklist_track_ids    1001tracklists URL -> matched track IDs
+    write_playlist         chord callback: one PlaylistWriter per playlist
+
+Artists and URLs fan out as a group over any number of workers; the playlist
+write stays a single task so membership dedupe and 100-track batching work
+as they do in-process. Each worker process builds its Spotify/OpenAI clients
+once (see lazy_client) and shares the on-disk caches and rate limiter
+settings with the other entry points.
+
+The broker and result backend come from `config` (CELERY_BROKER_URL,
+CELERY_RESULT_BACKEND). For tests and single-node runs:
+
+    CELERY_BROKER_URL=memory:// + CELERY_TASK_ALWAYS_EAGER=true   in-process, no worker
+    CELERY_BROKER_URL=sqla+sqlite:///celery-broker.sqlite
+    CELERY_RESULT_BACKEND=db+sqlite:///celery-results.sqlite       one machine, no Redis
+
+Usage:
+    celery -A tasks worker --concurrency 8
+    python tasks.py lineup lineup.txt --playlist "Pop-Kultur 2025"
+    python tasks.py tracklists urls.txt --playlist "Escuchar"
+"""
+
+import importlib
+from typing import Dict, List
+
+from celery import Celery, chord
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config import get_config  # noqa: E402  (Config reads the environment at import)
+
+# Named after this module so tasks sent by `python tasks.py` (run as __main__)
+# get the same names the `celery -A tasks` worker registers
+app = Celery("tasks")
+
+
+def configure(app: Celery, cfg=None) -> Celery:
+    """Apply broker, backend and delivery settings from a `config.Config`."""
+    cfg = cfg or get_config()
+    app.conf.update(
+        broker_url=cfg.CELERY_BROKER_URL,
+        result_backend=cfg.CELERY_RESULT_BACKEND,
+        task_always_eager=cfg.CELERY_TASK_ALWAYS_EAGER,
+        task_eager_propagates=True,
+        task_serializer="json",
+        result_serializer="json",
+        accept_content=["json"],
+        # Tasks are long network round trips: take one at a time, ack on completion
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
+    )
+    return app
+
+
+configure(app)
+
+
+def _festival():
+    return importlib.import_module("festival_playlist")
+
+
+def _scraper():
+    # Module name starts with a digit, so it can only be imported by string
+    return importlib.import_module("1003scraper")
+
+
+@app.task
+def resolve_artist(artist_name: str) -> Dict:
+    artist_id = _festival().get_artist_id(artist_name)
+    return {"name": artist_name, "artist_id": artist_id}
+
+
+@app.task
+def select_artist_tracks(resolved: Dict) -> Dict:
+    track_ids = []
+    if resolved.get("artist_id"):
+        track_ids = _festival().get_representative_tracks(resolved["artist_id"])
+    return dict(resolved, track_ids=track_ids)
+
+
+@app.task
+def tracklist_track_ids(url: str) -> Dict:
+    scraper = _scraper()
+    html = scraper.fetch_html(url)
+    track_ids = []
+    if html:
+        uris = scraper.find_spotify_uris(scraper.extract_tracks(html))
+        track_ids = [uri.rsplit(":", 1)[-1] for uri in uris]
+    return {"name": url, "track_ids": track_ids}
+
+
+@app.task
+def write_playlist(results: List[Dict], playlist_name: str) -> Dict:
+    """Commit every result's tracks through one PlaylistWriter."""
+    festival = _festival()
+    from playlist_writer import PlaylistWriter
+
+    user_id = festival.sp.current_user()["id"]
+    playlist_id, playlist_url = festival.get_or_create_playlist(user_id, playlist_name)
+    with PlaylistWriter(festival.sp, playlist_id) as writer:
+        for result in results:
+            writer.submit(result.get("track_ids") or [])
+
+    return {
+        "playlist_url": playlist_url,
+        "written": writer.written,
+        "writes": writer.writes,
+        "failed_tracks": len(writer.failed),
+        "not_found": [result["name"] for result in results if not result.get("track_ids")],
+    }
+
+
+def submit_lineup(artist_names: List[str], playlist_name: str):
+    """Queue one resolve -> select chain per artist, then a single playlist write."""
+    header = [resolve_artist.s(name) | select_artist_tracks.s() for name in artist_names]
+    return chord(header)(write_playlist.s(playlist_name))
+
+
+def submit_tracklists(urls: List[str], playlist_name: str):
+    """Queue one task per tracklist URL, then a single playlist write."""
+    return chord([tracklist_track_ids.s(url) for url in urls])(write_playlist.s(playlist_name))
+
+
+def _print_summary(summary: Dict):
+    print(f"\n✨ {summary['written']} tracks added in {summary['writes']} write(s)")
+    if summary["failed_tracks"]:
+        print(f"   ⚠️  {summary['failed_tracks']} tracks could not be added")
+    if summary["not_found"]:
+        print(f"   ⚠️  {len(summary['not_found'])} with no tracks:")
+        for name in summary["not_found"][:10]:
+            print(f"      - {name}")
+    print(f"\n🔗 Playlist URL: {summary['playlist_url']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Queue playlist jobs for Celery workers")
+    parser.add_argument("kind", choices=["lineup", "tracklists"])
+    parser.add_argument("input", type=argparse.FileType("r", encoding="utf-8"),
+                        help="Lineup text, or one tracklist URL per line (- for stdin)")
+    parser.add_argument("--playlist", default="Escuchar")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds to wait for the result")
+    args = parser.parse_args()
+
+    text = args.input.read()
+    if args.kind == "lineup":
+        names = _festival().extract_artists_from_text(text)
+        print(f"📋 Queuing {len(names)} artists")
+        result = submit_lineup(names, args.playlist)
+    else:
+        urls = [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+        print(f"📋 Queuing {len(urls)} tracklists")
+        result = submit_tracklists(urls, args.playlist)
+
+    _print_summary(result.get(timeout=args.timeout))
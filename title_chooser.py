@@ -1,20 +1,28 @@
 import os
+import re
+import json
+from typing import List, Optional
 from dotenv import load_dotenv
-from openai import OpenAI
+from lazy_client import LazyClient
+from llm_cache import chat_completion
+from title_rules import CONFIDENCE_THRESHOLD, rule_clean_track_name
 
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY1"))
 
-def clean_track_name(dirty_title: str) -> str:
-    """
-    Uses OpenAI to extract the canonical song name from a messy DJ set listing.
-    It ignores labels, remix info, catalog codes, and extraneous metadata.
-    """
 
-    few_shot_prompt = """You are a music researcher helping clean up DJ tracklist titles.
-Extract the canonical track name, ignoring the label (in brackets), remix/version notes, or catalog metadata.
+def _openai_client():
+    from openai import OpenAI
+
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY1"))
+
+
+# Built on first use so importing this module needs no credentials
+client = LazyClient(_openai_client)
+
+CLEANING_INSTRUCTIONS = """You are a music researcher helping clean up DJ tracklist titles.
+Extract the canonical track name, ignoring the label (in brackets), remix/version notes, or catalog metadata."""
 
-Examples:
+CLEANING_EXAMPLES = """Examples:
 Input: "Jeff Mills - The Bells [PURPOSE MAKER]"
 Output: The Bells
 
@@ -52,37 +60,216 @@ Input: "Camisra - Let Me Show You [ALTRA MODA]"
 Output: Let Me Show You
 
 Input: "Mathew Jonson - Panna Cotta [ITISWHATITIS (CLONE)]"
-Output: Panna Cotta
+Output: Panna Cotta"""
+
+# Rough budget for the titles in one batched request (~4 characters per token)
+BATCH_TOKEN_BUDGET = 1500
+BATCH_MAX_TITLES = 50
+CHARS_PER_TOKEN = 4
+
+
+def clean_track_name(dirty_title: str) -> str:
+    """
+    Uses OpenAI to extract the canonical song name from a messy DJ set listing.
+    It ignores labels, remix info, catalog codes, and extraneous metadata.
+    Titles the local rules in `title_rules` handle confidently never reach the API.
+    """
 
-Now extract the canonical track name from the following:
+    cleaned, confidence = rule_clean_track_name(dirty_title)
+    if confidence >= CONFIDENCE_THRESHOLD:
+        print(f"[🧼] Cleaned track name: '{cleaned}' from '{dirty_title}' (rules, {confidence:.2f})")
+        return cleaned
 
-Input: "{dirty_title}"
-Output:"""
+    return _clean_track_name_llm(dirty_title)
 
-    prompt = few_shot_prompt.format(dirty_title=dirty_title)
 
-    response = client.chat.completions.create(
+def _clean_track_name_llm(dirty_title: str) -> str:
+    prompt = (
+        f"{CLEANING_INSTRUCTIONS}\n\n{CLEANING_EXAMPLES}\n\n"
+        "Now extract the canonical track name from the following:\n\n"
+        f'Input: "{dirty_title}"\n'
+        "Output:"
+    )
+
+    content = chat_completion(
+        client,
         model="gpt-4",
         messages=[{"role": "user", "content": prompt}],
         temperature=0.2,
     )
 
-    cleaned = response.choices[0].message.content.strip().strip('"')
+    cleaned = content.strip().strip('"')
     print(f"[🧼] Cleaned track name: '{cleaned}' from '{dirty_title}'")
     return cleaned
 
-def song_chooser(track_name, spotify_track_options, prompt_suffix=""):
+
+def clean_track_names(dirty_titles: List[str]) -> List[str]:
     """
-    Uses GPT to pick the most likely correct Spotify track given a cleaned title and options.
+    Batched `clean_track_name`: cleans many titles with one request per chunk.
+
+    Titles are deduplicated and run through the local rules first; only the
+    low-confidence ones go to the LLM, split into chunks that fit
+    BATCH_TOKEN_BUDGET. Each chunk asks for a JSON array of cleaned names in
+    input order. Any entry that comes back missing or implausible is retried
+    on its own.
+
+    Args:
+        dirty_titles (list): Raw tracklist titles.
+
+    Returns:
+        list: Cleaned titles, aligned with `dirty_titles`.
+    """
+    unique_titles = list(dict.fromkeys(dirty_titles))
+    cleaned = {}
+
+    for dirty_title in unique_titles:
+        result, confidence = rule_clean_track_name(dirty_title)
+        if confidence >= CONFIDENCE_THRESHOLD:
+            cleaned[dirty_title] = result
+    escalated = [title for title in unique_titles if title not in cleaned]
+
+    for chunk in _chunk_by_token_budget(escalated):
+        try:
+            results = _clean_chunk(chunk)
+        except Exception as e:
+            print(f"[!] Batch cleaning failed for {len(chunk)} titles: {e}")
+            results = [None] * len(chunk)
+
+        for dirty_title, result in zip(chunk, results):
+            result = _validated_clean_title(dirty_title, result)
+            if result:
+                cleaned[dirty_title] = result
+
+    failed = [title for title in unique_titles if title not in cleaned]
+    if failed:
+        print(f"[🧼] Falling back to single-title cleaning for {len(failed)} title(s)")
+    for dirty_title in failed:
+        try:
+            cleaned[dirty_title] = _clean_track_name_llm(dirty_title)
+        except Exception as e:
+            print(f"[!] Error cleaning '{dirty_title}': {e}")
+            cleaned[dirty_title] = dirty_title
+
+    print(
+        f"[🧼] Cleaned {len(unique_titles)} unique titles: {len(unique_titles) - len(escalated)} by rules, "
+        f"{len(escalated)} sent to the LLM, {len(failed)} single-title fallback(s)"
+    )
+    return [cleaned[title] for title in dirty_titles]
+
+
+def _chunk_by_token_budget(titles: List[str]) -> List[List[str]]:
+    chunks = []
+    current = []
+    current_tokens = 0
+    for title in titles:
+        tokens = len(title) // CHARS_PER_TOKEN + 8  # quotes, comma, index overhead
+        if current and (current_tokens + tokens > BATCH_TOKEN_BUDGET or len(current) >= BATCH_MAX_TITLES):
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+        current.append(title)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _clean_chunk(titles: List[str]) -> List[str]:
+    prompt = (
+        f"{CLEANING_INSTRUCTIONS}\n\n{CLEANING_EXAMPLES}\n\n"
+        f"Now extract the canonical track name from each of the {len(titles)} inputs below.\n"
+        "Return ONLY a JSON array of strings with exactly one output per input, in the same order.\n\n"
+        f"Inputs:\n{json.dumps(titles, ensure_ascii=False, indent=0)}"
+    )
+
+    content = chat_completion(
+        client,
+        model="gpt-4",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.2,
+    )
+
+    result = content.strip()
+    # Remove markdown code blocks if present
+    if result.startswith("```"):
+        result = re.sub(r'^```(?:json)?\s*\n', '', result)
+        result = re.sub(r'\n```\s*$', '', result)
+
+    parsed = json.loads(result)
+    if not isinstance(parsed, list):
+        raise ValueError(f"expected a JSON array, got {type(parsed).__name__}")
+    if len(parsed) != len(titles):
+        print(f"[!] Batch returned {len(parsed)} results for {len(titles)} titles; validating by position")
+    return (parsed + [None] * len(titles))[:len(titles)]
+
+
+def _validated_clean_title(dirty_title: str, cleaned) -> Optional[str]:
+    """Return the normalized cleaned title if it is a non-empty piece of the original."""
+    if not isinstance(cleaned, str):
+        return None
+    cleaned = " ".join(cleaned.strip().strip('"').split())
+    if not cleaned or cleaned.casefold() not in " ".join(dirty_title.split()).casefold():
+        return None
+    return cleaned
+
+
+def song_chooser(track_name, spotify_track_options, prompt_suffix="", artist_name=None):
+    """
+    Picks the most likely correct Spotify track given a cleaned title and options.
+
+    The local scorer in `candidate_scorer` decides when its top pick clearly
+    beats the runner-up; only close calls are sent to GPT, and if GPT fails
+    the scorer's top pick is used.
 
     Args:
         track_name (str): Cleaned track name.
         spotify_track_options (list): List of Spotify track objects.
         prompt_suffix (str): Optional extra prompt context.
+        artist_name (str): Optional artist credited in the tracklist.
 
     Returns:
         dict: Chosen Spotify track object.
     """
+    return choose_songs([(track_name, artist_name)], [spotify_track_options], prompt_suffix)[0]
+
+
+def choose_songs(queries, candidate_lists, prompt_suffix=""):
+    """
+    Batched `song_chooser`: ranks every track's candidates in one vectorized pass.
+
+    Args:
+        queries (list): (cleaned title, artist or None) per track.
+        candidate_lists (list): Spotify track objects per track.
+        prompt_suffix (str): Optional extra prompt context for the LLM fallback.
+
+    Returns:
+        list: Chosen Spotify track object (or None) per track.
+    """
+    # numpy is only needed once there is something to rank
+    from candidate_scorer import rank_candidates
+
+    chosen = []
+    deferred = 0
+    for (track_name, _), options, (best, margin, confident) in zip(
+        queries, candidate_lists, rank_candidates(queries, candidate_lists)
+    ):
+        if best is None:
+            chosen.append(None)
+        elif confident:
+            chosen.append(options[best])
+        else:
+            deferred += 1
+            # No key, or an unusable reply: fall back to the scorer's pick rather than dropping the track
+            pick = _song_chooser_llm(track_name, options, prompt_suffix)
+            chosen.append(pick if pick is not None else options[best])
+
+    if len(queries) > 1:
+        print(f"[🎯] Chose {len(queries)} tracks: {len(queries) - deferred} locally, {deferred} deferred to the LLM")
+    return chosen
+
+
+def _song_chooser_llm(track_name, spotify_track_options, prompt_suffix=""):
+    """Uses GPT to pick the most likely correct Spotify track."""
     options_text = "\n".join([
         f"{i+1}. {t['name']} by {', '.join([a['name'] for a in t['artists']])} (Popularity: {t['popularity']})"
         for i, t in enumerate(spotify_track_options)
@@ -101,7 +288,8 @@ def song_chooser(track_name, spotify_track_options, prompt_suffix=""):
     )
 
     try:
-        response = client.chat.completions.create(
+        content = chat_completion(
+            client,
             model="gpt-4",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -109,7 +297,9 @@ def song_chooser(track_name, spotify_track_options, prompt_suffix=""):
             ],
             temperature=0.2,
         )
-        selected_index = int(response.choices[0].message.content.strip()) - 1
+        selected_index = int(content.strip()) - 1
+        if not 0 <= selected_index < len(spotify_track_options):
+            raise ValueError(f"choice {selected_index + 1} is not in the list")
         return spotify_track_options[selected_index]
     except Exception as e:
         print(f"[!] Error selecting track: {e}")
@@ -0,0 +1,79 @@
+"""
+Deterministic title cleaning for DJ tracklist entries.
+
+Most tracklist titles look like "Artist - Title (Some Remix) [LABEL]". This
+strips the label brackets, remix/edit/version parentheticals, catalog codes
+and the artist prefix locally, and scores how sure it is. `title_chooser`
+only sends titles to the LLM when the score is below CONFIDENCE_THRESHOLD.
+"""
+
+import re
+from typing import Tuple
+
+CONFIDENCE_THRESHOLD = 0.75
+
+# "[LABEL]", "[NEO RECORDS / ROBBINS]", "[ITISWHATITIS (CLONE)]"
+BRACKETS_RE = re.compile(r"\s*\[[^\[\]]*\]")
+# "(Taucher Remix)", "(Club Caviar Radio Edit)", "(feat. Someone)"
+VERSION_WORDS = (
+    r"remix|mix|edit|version|dub|rework|remaster(?:ed)?|vip|bootleg|re-?edit|"
+    r"instrumental|acapella|a cappella|flip|refix|feat\.?|ft\.?|featuring|rmx"
+)
+VERSION_PAREN_RE = re.compile(rf"\s*\((?=[^()]*\b(?:{VERSION_WORDS})(?:\b|\s|$))[^()]*\)", re.IGNORECASE)
+# "Title - Original Mix" (Beatport style suffix)
+VERSION_SUFFIX_RE = re.compile(rf"\s+[-–]\s+[^-–]*\b(?:{VERSION_WORDS})\s*$", re.IGNORECASE)
+# Trailing catalog numbers like "KOSMO001", "XLS-123", "POS 12"
+CATALOG_RE = re.compile(r"\s+[-–]?\s*\b[A-Z]{2,8}[ -]?\d{2,6}[A-Z]?$")
+ARTIST_SEPARATOR_RE = re.compile(r"\s+[-–—]\s+")
+UNKNOWN_TITLE_RE = re.compile(r"^(?:id|\?+|unknown|untitled)$", re.IGNORECASE)
+
+
+def strip_version_info(title: str) -> str:
+    """Drop label brackets and remix/edit/version notes from a bare track title."""
+    title = BRACKETS_RE.sub("", title)
+    title = VERSION_PAREN_RE.sub("", title)
+    return VERSION_SUFFIX_RE.sub("", title).strip()
+
+
+def rule_clean_track_name(dirty_title: str) -> Tuple[str, float]:
+    """
+    Clean a tracklist title without calling an LLM.
+
+    Args:
+        dirty_title (str): Raw title, with or without an "Artist - " prefix.
+
+    Returns:
+        tuple: (cleaned title, confidence between 0 and 1).
+    """
+    text = " ".join(dirty_title.strip().strip('"').split())
+    confidence = 1.0
+
+    text = BRACKETS_RE.sub("", text)
+    text = VERSION_PAREN_RE.sub("", text).strip()
+
+    parts = ARTIST_SEPARATOR_RE.split(text, maxsplit=1)
+    if len(parts) == 2:
+        text = parts[1]
+    else:
+        # Already a bare title, or a format we don't recognise
+        confidence -= 0.15
+
+    text = VERSION_SUFFIX_RE.sub("", text)
+    text = CATALOG_RE.sub("", text).strip(" -–")
+
+    if not text or UNKNOWN_TITLE_RE.match(text):
+        return text, 0.0
+    if ARTIST_SEPARATOR_RE.search(text):
+        # More separators than "Artist - Title" explains
+        confidence -= 0.4
+    if re.search(r"[\[\]()]", text):
+        # Parenthetical we didn't classify; might be part of the title
+        confidence -= 0.3
+    if re.search(r"\b(?:feat|ft)\.?\s", text, re.IGNORECASE):
+        confidence -= 0.2
+    if len(text) > 60:
+        confidence -= 0.2
+    if not re.search(r"\w", text):
+        confidence = 0.0
+
+    return text, max(0.0, round(confidence, 2))
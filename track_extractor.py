@@ -110,59 +110,193 @@
 
 import os
 import re
-import csv
-from bs4 import BeautifulSoup
-from typing import List, Tuple, Union
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple, Union
+
+from track_sinks import open_sink
 
 DEFAULT_INPUT_DIR = "sets"
 DEFAULT_OUTPUT_CSV = "tracks_output.csv"
-
-def extract_tracks_from_html(html_content: str, source_file: str) -> List[Tuple[str, str, str]]:
-    soup = BeautifulSoup(html_content, "html.parser")
+DEFAULT_BACKEND = "bs4"
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+# Files per pool task: enough that small pages aren't dominated by IPC, few
+# enough that one slow chunk doesn't leave the other workers idle at the end
+TASKS_PER_WORKER = 4
+BACKENDS = ("bs4", "lxml", "selectolax")
+
+MUSIC_RECORDING_ITEMTYPE = "http://schema.org/MusicRecording"
+# Text BeautifulSoup's get_text() leaves out; the other backends match it.
+# Known gap: libxml2 drops text after </html> and lexbor merges it into
+# <body>, so pages with junk past the closing tag can differ in the crude
+# fallback. benchmarks/bench_extractor_backends.py checks a corpus.
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+class _SoupDocument:
+    """html.parser BeautifulSoup tree (the reference backend)."""
+
+    def __init__(self, html_content):
+        from bs4 import BeautifulSoup
+
+        self.soup = BeautifulSoup(html_content, "html.parser")
+
+    def class_texts(self, class_name):
+        return [element.get_text(strip=True) for element in self.soup.select(f".{class_name}")]
+
+    def music_recordings(self):
+        recordings = []
+        for div in self.soup.select(f"div[itemtype='{MUSIC_RECORDING_ITEMTYPE}']"):
+            title = div.find("meta", {"itemprop": "name"})
+            artist = div.find("meta", {"itemprop": "byArtist"})
+            if title and artist:
+                recordings.append((title.get("content", ""), artist.get("content", "")))
+        return recordings
+
+    def text_lines(self):
+        return self.soup.get_text("\n", strip=True).splitlines()
+
+
+class _LxmlDocument:
+    """libxml2 tree; class and schema.org lookups run as XPath in C."""
+
+    def __init__(self, html_content):
+        import lxml.html
+
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        self.root = lxml.html.document_fromstring(html_content.encode("utf-8"), parser=parser)
+
+    def class_texts(self, class_name):
+        elements = self.root.xpath(
+            "//*[contains(concat(' ', normalize-space(@class), ' '), $token)]", token=f" {class_name} "
+        )
+        return ["".join(self._strings(element)) for element in elements]
+
+    def music_recordings(self):
+        recordings = []
+        for div in self.root.xpath("//div[@itemtype=$itemtype]", itemtype=MUSIC_RECORDING_ITEMTYPE):
+            title = div.xpath("(.//meta[@itemprop='name'])[1]")
+            artist = div.xpath("(.//meta[@itemprop='byArtist'])[1]")
+            if title and artist:
+                recordings.append((title[0].get("content", ""), artist[0].get("content", "")))
+        return recordings
+
+    def text_lines(self):
+        return "\n".join(self._strings(self.root)).splitlines()
+
+    @staticmethod
+    def _strings(root):
+        """Stripped, non-empty text under `root` in document order, like get_text(strip=True)."""
+        from lxml import etree
+
+        skipping = 0
+        for event, element in etree.iterwalk(root, events=("start", "end")):
+            is_tag = isinstance(element.tag, str)
+            if event == "start":
+                if is_tag and element.tag in NON_TEXT_TAGS:
+                    skipping += 1
+                elif is_tag and not skipping and element.text and element.text.strip():
+                    yield element.text.strip()
+            else:
+                if is_tag and element.tag in NON_TEXT_TAGS:
+                    skipping -= 1
+                if element is not root and not skipping and element.tail and element.tail.strip():
+                    yield element.tail.strip()
+
+
+class _SelectolaxDocument:
+    """lexbor tree via selectolax."""
+
+    def __init__(self, html_content):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self.tree = LexborHTMLParser(html_content)
+
+    def class_texts(self, class_name):
+        return ["".join(self._strings(node)) for node in self.tree.css(f".{class_name}")]
+
+    def music_recordings(self):
+        recordings = []
+        for div in self.tree.css(f"div[itemtype='{MUSIC_RECORDING_ITEMTYPE}']"):
+            title = div.css_first("meta[itemprop='name']")
+            artist = div.css_first("meta[itemprop='byArtist']")
+            if title and artist:
+                recordings.append((title.attributes.get("content") or "", artist.attributes.get("content") or ""))
+        return recordings
+
+    def text_lines(self):
+        if self.tree.root is None:
+            return []
+        return "\n".join(self._strings(self.tree.root)).splitlines()
+
+    @staticmethod
+    def _strings(root):
+        for node in root.traverse(include_text=True):
+            if node.tag != "-text" or (node.parent and node.parent.tag in NON_TEXT_TAGS):
+                continue
+            text = (node.text_content or "").strip()
+            if text:
+                yield text
+
+
+_DOCUMENTS = {
+    "bs4": _SoupDocument,
+    "lxml": _LxmlDocument,
+    "selectolax": _SelectolaxDocument,
+}
+
+
+def extract_tracks_from_html(html_content: str, source_file: str, backend: str = DEFAULT_BACKEND) -> List[Tuple[str, str, str]]:
+    return extract_tracks_with_strategy(html_content, source_file, backend)[0]
+
+def extract_tracks_with_strategy(html_content: str, source_file: str, backend: str = DEFAULT_BACKEND) -> Tuple[List[Tuple[str, str, str]], str]:
+    """Like extract_tracks_from_html, but also names the strategy that produced the tracks."""
+    if not html_content.strip():
+        return [], "empty"
+    doc = _DOCUMENTS[backend](html_content)
     tracks = []
 
     # Try 1001Tracklists format
-    track_elements = soup.select(".trackValue")
-    if track_elements:
-        for element in track_elements:
-            text = element.get_text(strip=True)
+    texts = doc.class_texts("trackValue")
+    if texts:
+        for text in texts:
             if " - " in text:
                 artist, title = text.split(" - ", 1)
                 tracks.append((title.strip(), artist.strip(), source_file))
         if tracks:
-            return tracks
+            return tracks, "trackValue"
 
     # Fallback: original trackFormat__text format
-    tl_rows = soup.select(".trackFormat__text")
-    if tl_rows:
-        for row in tl_rows:
-            text = row.get_text(strip=True)
+    texts = doc.class_texts("trackFormat__text")
+    if texts:
+        for text in texts:
             if " - " in text:
                 artist, title = text.split(" - ", 1)
                 tracks.append((title.strip(), artist.strip(), source_file))
         if tracks:
-            return tracks
+            return tracks, "trackFormat__text"
 
     # Beatport-style metadata
-    tl_divs = soup.select("div[itemtype='http://schema.org/MusicRecording']")
-    for div in tl_divs:
-        title = div.find("meta", {"itemprop": "name"})
-        artist = div.find("meta", {"itemprop": "byArtist"})
-        if title and artist:
-            title_text = title.get("content", "").strip()
-            artist_text = artist.get("content", "").strip()
-            if title_text and artist_text:
-                tracks.append((title_text, artist_text, source_file))
+    for title, artist in doc.music_recordings():
+        title_text = title.strip()
+        artist_text = artist.strip()
+        if title_text and artist_text:
+            tracks.append((title_text, artist_text, source_file))
+    recording_count = len(tracks)
 
     # Crude fallback
-    all_text = soup.get_text("\n", strip=True)
-    for line in all_text.splitlines():
+    for line in doc.text_lines():
         if " - " in line and len(line.split(" - ")) == 2:
             artist, title = line.split(" - ", 1)
             if 2 < len(title.strip()) < 150:
                 tracks.append((title.strip(), artist.strip(), source_file))
 
-    return tracks
+    if not tracks:
+        return tracks, "none"
+    if not recording_count:
+        return tracks, "text"
+    return tracks, "schema.org" if recording_count == len(tracks) else "schema.org+text"
 
 def clean_redundant_artist_from_title(tracks: List[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
     cleaned_tracks = []
@@ -172,28 +306,140 @@ def clean_redundant_artist_from_title(tracks: List[Tuple[str, str, str]]) -> Lis
         cleaned_tracks.append((cleaned_title, artist, source_file))
     return cleaned_tracks
 
-def extract_tracks_from_path(input_path: Union[str, os.PathLike], output_csv_path: str):
-    all_tracks = []
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def extract_tracks_from_file(path: str, backend: str = DEFAULT_BACKEND) -> Tuple[List[Tuple[str, str, str]], str, str]:
+    """Return (tracks, strategy, sha256 of the file) for one saved page."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    # Same newline translation as opening the file in text mode
+    html = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    tracks, strategy = extract_tracks_with_strategy(html, os.path.basename(path), backend)
+    return tracks, strategy, hashlib.sha256(raw).hexdigest()
+
+def _extract_file_task(task: Tuple[str, str]):
+    # Module-level so the process pool can pickle it
+    path, backend = task
+    return extract_tracks_from_file(path, backend)
+
+def extract_tracks_from_files(paths: List[str], backend: str = DEFAULT_BACKEND, workers: int = 1):
+    """
+    Yield extract_tracks_from_file's result for each path, in the order of `paths`.
+
+    With workers > 1 the files are parsed in a process pool. Workers read the
+    files themselves and tasks go out in chunks, so only paths and extracted
+    tuples cross process boundaries.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield extract_tracks_from_file(path, backend)
+        return
+
+    # Deferred: loading the process-pool machinery costs more than a serial run of a few files
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(workers, len(paths))
+    chunksize = max(1, len(paths) // (workers * TASKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_extract_file_task, [(path, backend) for path in paths], chunksize=chunksize)
+
+def load_manifest(manifest_path: str, backend: str = DEFAULT_BACKEND) -> Dict[str, dict]:
+    """
+    Per-file entries (size, mtime, sha256, strategy, tracks) from the last run, keyed by file name.
+
+    Entries written by a different backend are discarded: the backends can
+    disagree on malformed pages, so switching `--backend` re-parses everything.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("backend") != backend:
+        return {}
+    return manifest.get("files", {})
+
+def save_manifest(manifest_path: str, files: Dict[str, dict], backend: str = DEFAULT_BACKEND):
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "backend": backend, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def _unchanged(path: str, stat: os.stat_result, entry: Optional[dict]) -> bool:
+    if entry is None or entry.get("size") != stat.st_size:
+        return False
+    if entry.get("mtime") == stat.st_mtime:
+        return True
+    # Touched but maybe not edited (re-download, copy): let the content decide
+    return entry.get("sha256") == file_sha256(path)
+
+def extract_tracks_from_path(input_path: Union[str, os.PathLike], output_csv_path: str, backend: str = DEFAULT_BACKEND, workers: int = 1, full: bool = False):
+    """
+    Extract every saved page under `input_path` into `output_csv_path`.
+
+    The output format follows the extension (see track_sinks): CSV by
+    default, SQLite for .sqlite/.db, Parquet for .parquet. A manifest next
+    to the output remembers the backend and each file's size, mtime, hash
+    and winning strategy. Unless `full` is set, only new or changed files are
+    parsed; rows for the rest are carried over from the existing output and rows
+    for deleted files are dropped.
+    """
+    input_path = os.fspath(input_path)
     if os.path.isdir(input_path):
-        for file in os.listdir(input_path):
-            if file.endswith(".html"):
-                with open(os.path.join(input_path, file), "r", encoding="utf-8") as f:
-                    html = f.read()
-                    tracks = extract_tracks_from_html(html, file)
-                    all_tracks.extend(tracks)
+        paths = [os.path.join(input_path, file) for file in sorted(os.listdir(input_path)) if file.endswith(".html")]
     elif input_path.endswith(".html"):
-        with open(input_path, "r", encoding="utf-8") as f:
-            html = f.read()
-            tracks = extract_tracks_from_html(html, os.path.basename(input_path))
-            all_tracks.extend(tracks)
+        paths = [input_path]
+    else:
+        paths = []
+
+    sink = open_sink(output_csv_path)
+    manifest_path = output_csv_path + MANIFEST_SUFFIX
+    previous = {} if full or not sink.exists() else load_manifest(manifest_path, backend)
+    previous_rows = sink.rows_by_source() if previous else {}
+
+    files = {}
+    stats = {}
+    stale_paths = []
+    for path in paths:
+        name = os.path.basename(path)
+        stats[name] = os.stat(path)
+        entry = previous.get(name)
+        if _unchanged(path, stats[name], entry) and len(previous_rows.get(name, [])) == entry.get("tracks"):
+            files[name] = dict(entry, mtime=stats[name].st_mtime)
+        else:
+            stale_paths.append(path)
+
+    rows_by_source = {name: previous_rows.get(name, []) for name in files}
+    strategies = {}
+    for path, (tracks, strategy, sha256) in zip(stale_paths, extract_tracks_from_files(stale_paths, backend, workers)):
+        name = os.path.basename(path)
+        rows_by_source[name] = clean_redundant_artist_from_title(tracks)
+        files[name] = {
+            "size": stats[name].st_size,
+            "mtime": stats[name].st_mtime,
+            "sha256": sha256,
+            "strategy": strategy,
+            "tracks": len(tracks),
+        }
+        strategies[strategy] = strategies.get(strategy, 0) + 1
 
-    all_tracks = clean_redundant_artist_from_title(all_tracks)
+    all_tracks = []
+    for path in paths:
+        all_tracks.extend(rows_by_source[os.path.basename(path)])
 
-    with open(output_csv_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["title", "artist", "source_file"])
-        writer.writerows(all_tracks)
+    sink.write(all_tracks)
+    save_manifest(manifest_path, files, backend)
 
+    if previous:
+        removed = len(set(previous) - set(files))
+        print(f"♻️  Reused {len(paths) - len(stale_paths)} unchanged files, parsed {len(stale_paths)}, dropped {removed} removed")
+    if strategies:
+        print("   Strategies: " + ", ".join(f"{name} {count}" for name, count in sorted(strategies.items())))
     print(f"✅ Saved {len(all_tracks)} tracks to {output_csv_path}")
 
 if __name__ == "__main__":
@@ -201,7 +447,10 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", default=DEFAULT_INPUT_DIR, help="Path to HTML file or folder of HTML files (default: sets/)")
-    parser.add_argument("--output", default=DEFAULT_OUTPUT_CSV, help="Output CSV file path (default: tracks_output.csv)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_CSV, help="Output file: .csv, .sqlite/.db or .parquet (default: tracks_output.csv)")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=BACKENDS, help="HTML parser backend (default: bs4)")
+    parser.add_argument("--workers", type=int, default=1, help="Parse files in N processes (default: 1, serial)")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-parse every file")
     args = parser.parse_args()
 
-    extract_tracks_from_path(args.input, args.output)
+    extract_tracks_from_path(args.input, args.output, args.backend, args.workers, args.full)
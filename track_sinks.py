@@ -0,0 +1,269 @@
+"""
+Output sinks for track_extractor.
+
+The sink is picked from the output file's extension:
+
+    tracks_output.csv       flat CSV (the original format)
+    tracks.sqlite / .db     SQLite table indexed on the normalized
+                            (artist, title) key and on source_file
+    tracks.parquet          Parquet sorted by the normalized key, so row-group
+                            statistics let readers skip most of the file
+                            (needs pyarrow)
+
+Every sink stores rows in extraction order and can hand them back grouped by
+source file, which is what the incremental manifest needs to carry unchanged
+sets over. The SQLite and Parquet sinks also answer "which sets played this
+track" and dedupe queries without loading the whole output.
+
+Usage:
+    python track_sinks.py tracks.sqlite --sets "Artist - Title"
+    python track_sinks.py tracks.parquet --distinct
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import unicodedata
+from typing import Dict, List, Tuple
+
+Track = Tuple[str, str, str]
+
+CSV_HEADER = ["title", "artist", "source_file"]
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+PARQUET_EXTENSIONS = (".parquet",)
+# Rows per Parquet row group; smaller groups mean finer-grained skipping
+PARQUET_ROW_GROUP_SIZE = 10000
+
+
+def normalize_key(text: str) -> str:
+    """Case-, accent- and punctuation-insensitive form used for lookups and dedupe."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w]+", " ", text.casefold()).split())
+
+
+class CsvSink:
+    """Plain CSV; lookups scan the whole file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def rows_by_source(self) -> Dict[str, List[Track]]:
+        rows = {}
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if len(row) == 3:
+                    rows.setdefault(row[2], []).append(tuple(row))
+        return rows
+
+    def write(self, tracks: List[Track]):
+        with open(self.path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(tracks)
+
+    def find_sets(self, artist: str, title: str) -> List[str]:
+        key = (normalize_key(artist), normalize_key(title))
+        sources = set()
+        for rows in self.rows_by_source().values():
+            for row_title, row_artist, source_file in rows:
+                if (normalize_key(row_artist), normalize_key(row_title)) == key:
+                    sources.add(source_file)
+        return sorted(sources)
+
+    def distinct_tracks(self) -> List[Tuple[str, str, int]]:
+        counts = {}
+        for rows in self.rows_by_source().values():
+            for row_title, row_artist, source_file in rows:
+                key = (normalize_key(row_artist), normalize_key(row_title))
+                entry = counts.setdefault(key, [row_title, row_artist, set()])
+                entry[2].add(source_file)
+        return sorted(((title, artist, len(sources)) for title, artist, sources in counts.values()),
+                      key=lambda track: (normalize_key(track[1]), normalize_key(track[0])))
+
+
+class SqliteSink:
+    """SQLite table with indexes on (norm_artist, norm_title) and source_file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS tracks (
+                position INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL,
+                source_file TEXT NOT NULL,
+                norm_artist TEXT NOT NULL,
+                norm_title TEXT NOT NULL
+            )"""
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS tracks_norm_key ON tracks (norm_artist, norm_title)")
+        db.execute("CREATE INDEX IF NOT EXISTS tracks_source_file ON tracks (source_file)")
+        return db
+
+    def rows_by_source(self) -> Dict[str, List[Track]]:
+        rows = {}
+        db = self._connect()
+        try:
+            for title, artist, source_file in db.execute(
+                "SELECT title, artist, source_file FROM tracks ORDER BY position"
+            ):
+                rows.setdefault(source_file, []).append((title, artist, source_file))
+        finally:
+            db.close()
+        return rows
+
+    def write(self, tracks: List[Track]):
+        db = self._connect()
+        try:
+            with db:
+                db.execute("DELETE FROM tracks")
+                db.executemany(
+                    "INSERT INTO tracks (position, title, artist, source_file, norm_artist, norm_title) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (position, title, artist, source_file, normalize_key(artist), normalize_key(title))
+                        for position, (title, artist, source_file) in enumerate(tracks)
+                    ),
+                )
+        finally:
+            db.close()
+
+    def find_sets(self, artist: str, title: str) -> List[str]:
+        db = self._connect()
+        try:
+            rows = db.execute(
+                "SELECT DISTINCT source_file FROM tracks WHERE norm_artist = ? AND norm_title = ? ORDER BY source_file",
+                (normalize_key(artist), normalize_key(title)),
+            ).fetchall()
+        finally:
+            db.close()
+        return [source_file for (source_file,) in rows]
+
+    def distinct_tracks(self) -> List[Tuple[str, str, int]]:
+        db = self._connect()
+        try:
+            # Walks the (norm_artist, norm_title) index instead of sorting the table
+            rows = db.execute(
+                "SELECT MIN(title), MIN(artist), COUNT(DISTINCT source_file) FROM tracks "
+                "GROUP BY norm_artist, norm_title ORDER BY norm_artist, norm_title"
+            ).fetchall()
+        finally:
+            db.close()
+        return [tuple(row) for row in rows]
+
+
+class ParquetSink:
+    """Parquet file sorted by the normalized key; lookups are pushed down as row-group filters."""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow") from None
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def rows_by_source(self) -> Dict[str, List[Track]]:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(self.path, columns=["position", "title", "artist", "source_file"])
+        table = table.sort_by("position")
+        rows = {}
+        for title, artist, source_file in zip(
+            table.column("title").to_pylist(),
+            table.column("artist").to_pylist(),
+            table.column("source_file").to_pylist(),
+        ):
+            rows.setdefault(source_file, []).append((title, artist, source_file))
+        return rows
+
+    def write(self, tracks: List[Track]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({
+            "position": list(range(len(tracks))),
+            "title": [track[0] for track in tracks],
+            "artist": [track[1] for track in tracks],
+            "source_file": [track[2] for track in tracks],
+            "norm_artist": [normalize_key(track[1]) for track in tracks],
+            "norm_title": [normalize_key(track[0]) for track in tracks],
+        })
+        table = table.sort_by([("norm_artist", "ascending"), ("norm_title", "ascending")])
+        tmp_path = self.path + ".tmp"
+        pq.write_table(table, tmp_path, row_group_size=PARQUET_ROW_GROUP_SIZE)
+        os.replace(tmp_path, self.path)
+
+    def find_sets(self, artist: str, title: str) -> List[str]:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(
+            self.path,
+            columns=["source_file"],
+            filters=[("norm_artist", "=", normalize_key(artist)), ("norm_title", "=", normalize_key(title))],
+        )
+        return sorted(set(table.column("source_file").to_pylist()))
+
+    def distinct_tracks(self) -> List[Tuple[str, str, int]]:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(self.path, columns=["title", "artist", "source_file", "norm_artist", "norm_title"])
+        grouped = table.group_by(["norm_artist", "norm_title"]).aggregate([
+            ("title", "min"), ("artist", "min"), ("source_file", "count_distinct"),
+        ]).sort_by([("norm_artist", "ascending"), ("norm_title", "ascending")])
+        return list(zip(
+            grouped.column("title_min").to_pylist(),
+            grouped.column("artist_min").to_pylist(),
+            grouped.column("source_file_count_distinct").to_pylist(),
+        ))
+
+
+def open_sink(path: str):
+    """Return the sink for `path` based on its extension (CSV unless it looks like SQLite or Parquet)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in SQLITE_EXTENSIONS:
+        return SqliteSink(path)
+    if extension in PARQUET_EXTENSIONS:
+        return ParquetSink(path)
+    return CsvSink(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query extracted tracks")
+    parser.add_argument("path", help="Output written by track_extractor (.csv, .sqlite, .parquet)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--sets", metavar="ARTIST - TITLE", help="List the sets that played this track")
+    group.add_argument("--distinct", action="store_true", help="List each distinct track once with its set count")
+    args = parser.parse_args()
+
+    sink = open_sink(args.path)
+    if args.sets:
+        if " - " not in args.sets:
+            parser.error('--sets expects "Artist - Title"')
+        artist, title = args.sets.split(" - ", 1)
+        sources = sink.find_sets(artist, title)
+        print(f"🎧 {len(sources)} sets played {args.sets}")
+        for source_file in sources:
+            print(f"   - {source_file}")
+    else:
+        tracks = sink.distinct_tracks()
+        for title, artist, set_count in tracks:
+            print(f"{artist} - {title}\t{set_count}")
+        print(f"✅ {len(tracks)} distinct tracks")